@@ -1,18 +1,27 @@
 import random
-import requests
 import json
 import re
+from contextlib import nullcontext
+from functools import lru_cache
+from llm_client import LLMClient
+from profiler import PROFILER
+
+_ACTION_RE = re.compile(r"Action:\s*(FOLD|CALL|RAISE)(?:\s+(\d+))?", re.IGNORECASE)
 
 class BaseAgent:
     def __init__(self, name="Agent"):
         self.name = name
         self.system_prompt = "You are a poker player. Play to win."
 
-    def get_action(self, game_state_str):
+    def get_action(self, game_state):
+        """
+        game_state: poker_env.Observation (str() renders the text view)
+        Returns (action_type, amount).
+        """
         raise NotImplementedError
 
 class RandomAgent(BaseAgent):
-    def get_action(self, game_state_str):
+    def get_action(self, game_state):
         # Naive random action
         actions = ['fold', 'call', 'raise']
         chosen = random.choice(actions)
@@ -22,10 +31,18 @@ class RandomAgent(BaseAgent):
         return chosen, amount
 
 class LLMAgent(BaseAgent):
-    def __init__(self, name="LLM_Bot", model_name="local-model", api_url="http://localhost:1234/v1/chat/completions", system_prompt=None):
+    def __init__(self, name="LLM_Bot", model_name="local-model", api_url="http://localhost:1234/v1/chat/completions", system_prompt=None, limiter=None, client=None, cache=None, stream=False):
         super().__init__(name)
         self.model_name = model_name
         self.api_url = api_url
+        # Agents on the same endpoint share one pooled keep-alive client
+        self.client = client or LLMClient.shared(api_url)
+        # Shared semaphore capping concurrent requests to the LLM server across tables
+        self.limiter = limiter or nullcontext()
+        # Optional decision_cache.DecisionCache shared by agents
+        self.cache = cache
+        # Stream the completion and stop it at the first complete Action line
+        self.stream = stream
         self.system_prompt = system_prompt or """
         You are a professional Poker Player playing a Spin & Go tournament (3-Max No Limit Hold'em).
         You are given the current Game State.
@@ -42,11 +59,18 @@ class LLMAgent(BaseAgent):
         Action: [Action]
         """
 
-    def get_action(self, game_state_str):
-        messages = [
-            {"role": "system", "content": self.system_prompt},
-            {"role": "user", "content": f"Current Game State:\n{game_state_str}\n\nWhat is your move?"}
-        ]
+    def get_action(self, game_state):
+        cache_key = self.cache.key(self.system_prompt, game_state) if self.cache else None
+        if cache_key:
+            cached = self.cache.get(cache_key)
+            if cached:
+                return cached
+
+        with PROFILER.phase("render"):
+            messages = [
+                {"role": "system", "content": self.system_prompt},
+                {"role": "user", "content": f"Current Game State:\n{game_state}\n\nWhat is your move?"}
+            ]
         
         payload = {
             "model": self.model_name,
@@ -56,18 +80,39 @@ class LLMAgent(BaseAgent):
         }
         
         try:
-            response = requests.post(self.api_url, json=payload, headers={"Content-Type": "application/json"}, timeout=10)
-            response.raise_for_status()
-            result = response.json()
-            content = result['choices'][0]['message']['content']
-            return self._parse_output(content)
+            with self.limiter:
+                if self.stream:
+                    decision = self._stream_action(payload)
+                else:
+                    result = self.client.chat(payload, timeout=10)
+                    decision = self._parse_output(result['choices'][0]['message']['content'])
+            if decision is None:
+                return 'call', 0 # Default fallback, never cached
+            if cache_key:
+                self.cache.put(cache_key, decision)
+            return decision
         except Exception as e:
             print(f"Error calling LLM: {e}")
             return 'fold', 0 # Safe fallback
 
+    def _stream_action(self, payload):
+        content = ""
+        stream = self.client.stream_chat(payload, timeout=10)
+        try:
+            for delta in stream:
+                content += delta
+                # Only complete lines count, so "RAISE 6" is not taken for "RAISE 60"
+                match = _ACTION_RE.search(content, 0, content.rfind("\n") + 1)
+                if match:
+                    return self._parse_output(match.group(0))
+        finally:
+            # Closing the stream drops the connection, which stops generation
+            stream.close()
+        return self._parse_output(content)
+
     def _parse_output(self, content):
-        # Regex to find Action: ...
-        match = re.search(r"Action:\s*(FOLD|CALL|RAISE)(?:\s+(\d+))?", content, re.IGNORECASE)
+        # Regex to find Action: ...; None if the reply has no action line
+        match = _ACTION_RE.search(content)
         if match:
             action_type = match.group(1).lower()
             amount_str = match.group(2)
@@ -75,4 +120,123 @@ class LLMAgent(BaseAgent):
             return action_type, amount
         else:
             print(f"Failed to parse LLM output: {content}")
-            return 'call', 0 # Default fallback
+            return None
+
+
+# Shared per process and built on first use, so native agents stay cheap to
+# pickle into PopulationEvaluator's worker processes
+@lru_cache(maxsize=None)
+def _preflop_table():
+    from preflop import PreflopTable
+    return PreflopTable()
+
+@lru_cache(maxsize=None)
+def _equity_calculator():
+    from equity import EquityCalculator
+    return EquityCalculator(batch_size=256, max_rollouts=256, tolerance=0.03)
+
+@lru_cache(maxsize=None)
+def _default_solver():
+    from cfr import BucketedCFR
+    return BucketedCFR().train(2000)
+
+def hand_strength(game_state):
+    """Equity of the hand against the opponents still in, exact lookup preflop."""
+    num_players = game_state.num_opponents + 1
+    if game_state.stage == 'PREFLOP' and num_players in (2, 3):
+        return _preflop_table().equity(game_state.hand, num_players)
+    # Rollouts seeded by the cards, so the estimate does not depend on which
+    # process or thread plays the match, or on what it played before
+    seed = [*game_state.hand, *game_state.community, game_state.num_opponents]
+    return _equity_calculator().estimate_obs(game_state, seed=seed).equity
+
+def prepare_tables(agents):
+    """
+    Loads (building on first use) the tables native agents rely on, in this
+    process. Called before a process pool starts, so workers inherit them
+    instead of each building the same files at once.
+    """
+    agents = list(agents)
+    if any(isinstance(agent, (EquityAgent, PushFoldAgent, CFRAgent)) for agent in agents):
+        _preflop_table()
+        _equity_calculator()
+    if any(isinstance(agent, CFRAgent) and agent.solver is None for agent in agents):
+        _default_solver()
+
+def pot_raise(game_state):
+    """Total bet for a pot-sized raise."""
+    return game_state.pot + 2 * game_state.to_call
+
+class EquityAgent(BaseAgent):
+    """
+    Calls when its equity beats the pot odds and raises pot when the
+    equity is raise_edge times its fair share of the pot.
+    """
+    def __init__(self, name="Equity_Bot", raise_edge=1.3, call_margin=0.0):
+        super().__init__(name)
+        self.raise_edge = raise_edge
+        self.call_margin = call_margin
+
+    def get_action(self, game_state):
+        equity = hand_strength(game_state)
+        if equity * (game_state.num_opponents + 1) >= self.raise_edge:
+            return 'raise', pot_raise(game_state)
+        pot_odds = game_state.to_call / (game_state.pot + game_state.to_call) if game_state.to_call else 0.0
+        if game_state.to_call == 0 or equity >= pot_odds + self.call_margin:
+            return 'call', 0
+        return 'fold', 0
+
+# Approximate heads-up Nash ranges (fraction of starting hands) for jamming
+# first in and for calling a jam, by effective stack in big blinds
+PUSH_CHART = {1: 1.0, 2: 0.9, 3: 0.8, 4: 0.72, 5: 0.65, 6: 0.6, 8: 0.52, 10: 0.46, 12: 0.4, 15: 0.34}
+CALL_CHART = {1: 1.0, 2: 0.75, 3: 0.6, 4: 0.52, 5: 0.46, 6: 0.42, 8: 0.36, 10: 0.32, 12: 0.28, 15: 0.24}
+
+class PushFoldAgent(BaseAgent):
+    """
+    Short-stack push/fold play from PUSH_CHART and CALL_CHART. Ranges are
+    split between opponents when more than one is left. Deeper than the
+    chart, or after the flop, it defers to fallback (an EquityAgent).
+    Stacks are measured in the observation's big blind, so it follows
+    rising blinds; big_blind is used when the observation has none.
+    """
+    def __init__(self, name="PushFold_Bot", big_blind=20, fallback=None):
+        super().__init__(name)
+        self.big_blind = big_blind
+        self.max_stack_bb = max(PUSH_CHART)
+        self.fallback = fallback or EquityAgent(name)
+
+    def get_action(self, game_state):
+        big_blind = game_state.big_blind or self.big_blind
+        stack_bb = game_state.stack / big_blind
+        if game_state.stage != 'PREFLOP' or stack_bb > self.max_stack_bb:
+            return self.fallback.get_action(game_state)
+
+        facing_jam = game_state.to_call > big_blind
+        chart = CALL_CHART if facing_jam else PUSH_CHART
+        play_fraction = chart[min(bb for bb in chart if bb >= stack_bb)] / max(game_state.num_opponents, 1)
+        percentile = _preflop_table().percentile(game_state.hand, min(game_state.num_opponents + 1, 3))
+        if percentile >= 1.0 - play_fraction:
+            return ('call', 0) if facing_jam else ('raise', game_state.stack + game_state.pot)
+        return ('call', 0) if game_state.to_call == 0 else ('fold', 0)
+
+class CFRAgent(BaseAgent):
+    """
+    Plays the average strategy of a cfr.BucketedCFR solution. The hand is
+    bucketed by its heads-up equivalent equity; the betting history is
+    abstracted to unopened ('') or facing a bet ('r').
+    """
+    def __init__(self, name="CFR_Bot", solver=None):
+        super().__init__(name)
+        self.solver = solver
+
+    def get_action(self, game_state):
+        solver = self.solver or _default_solver()
+        equity = hand_strength(game_state) ** (1.0 / max(game_state.num_opponents, 1))
+        bucket = min(int(equity * solver.num_buckets), solver.num_buckets - 1)
+        history = 'r' if game_state.to_call else ''
+        actions = solver.actions(history)
+        probs = solver.average_strategy(history)[bucket]
+        action = random.choices(actions, weights=probs)[0]
+        if action == 'r':
+            return 'raise', pot_raise(game_state)
+        return ('fold', 0) if action == 'f' else ('call', 0)
@@ -0,0 +1,86 @@
+import ast
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+
+def normalize_code(code):
+    """AST dump of the code, so formatting and comments do not matter."""
+    try:
+        return ast.dump(ast.parse(code))
+    except SyntaxError:
+        return code
+
+
+def data_fingerprint(data):
+    """Content hash of a DataFrame (index, columns and values)."""
+    digest = hashlib.sha256()
+    digest.update(",".join(map(str, data.columns)).encode())
+    digest.update(pd.util.hash_pandas_object(data, index=True).values.tobytes())
+    return digest.hexdigest()[:16]
+
+
+def _scalar(value):
+    if isinstance(value, (np.integer, np.floating)):
+        return value.item()
+    if isinstance(value, (int, float, str, bool)) or value is None:
+        return value
+    return str(value) # Timestamps, Timedeltas
+
+
+class FitnessCache:
+    """
+    Fitness results keyed on (normalized strategy code, data fingerprint),
+    persisted as JSON so identical genomes are never backtested twice,
+    across generations or runs. Only the scalar backtest stats are kept.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+        if path and os.path.exists(path):
+            self.load(path)
+
+    def key(self, code, fingerprint):
+        return hashlib.sha256(f"{normalize_code(code)}|{fingerprint}".encode()).hexdigest()
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def put(self, key, fitness, stats):
+        self.entries[key] = {
+            "fitness": _scalar(fitness),
+            "stats": {k: _scalar(v) for k, v in stats.items() if not k.startswith('_')},
+        }
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def load(self, path):
+        with open(path) as f:
+            self.entries.update(json.load(f))
+
+    def save(self, path=None):
+        path = path or self.path
+        if not path:
+            return
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.entries, f)
+        os.replace(tmp_path, path)
@@ -1,14 +1,28 @@
 from .genome import StrategyGenome, simple_parameter_mutator
-from .fitness import evaluate_fitness
+from .fitness import DETERMINISTIC_ERRORS, evaluate_fitness
+from .parallel import ParallelEvaluator
+from .cache import FitnessCache, data_fingerprint
 import random
 
+
+def _cacheable(fitness, stats):
+    # A Sharpe ratio, or code that can never run; timeouts, memory errors,
+    # dead workers and backtest errors may score differently next time
+    return fitness != -999 or stats.get("Error") in DETERMINISTIC_ERRORS
+
+
 class EvolutionEngine:
-    def __init__(self, data, population_size=10, elite_size=2):
+    def __init__(self, data, population_size=10, elite_size=2, workers=1, timeout=60, cache_path=None):
         self.data = data
         self.population = []
         self.population_size = population_size
         self.elite_size = elite_size
         self.generation = 0
+        # Genomes run in sandboxed worker processes (None for every core); 0 evaluates in this process
+        self.evaluator = ParallelEvaluator(data, workers=workers, timeout=timeout) if workers != 0 else None
+        # Fitness memoized on normalized code + data, persisted to cache_path
+        self.fitness_cache = FitnessCache(cache_path)
+        self.data_fingerprint = data_fingerprint(data)
 
     def initialize_population(self, seed_code_list):
         """
@@ -29,9 +43,7 @@ class EvolutionEngine:
         print(f"--- Generation {self.generation} ---")
         
         # 1. Evaluate
-        for genome in self.population:
-            if genome.fitness is None: # Avoid re-evaluating
-                evaluate_fitness(genome, self.data)
+        self.evaluate([g for g in self.population if g.fitness is None]) # Avoid re-evaluating
 
         # 2. Sort by Fitness (Descending)
         self.population.sort(key=lambda g: g.fitness if g.fitness is not None else -9999, reverse=True)
@@ -57,3 +69,30 @@ class EvolutionEngine:
         self.population = next_gen
         self.generation += 1
         return best
+
+    def evaluate(self, genomes):
+        """Sets fitness on genomes, backtesting each distinct strategy only once."""
+        by_key = {}
+        for genome in genomes:
+            key = self.fitness_cache.key(genome.code, self.data_fingerprint)
+            cached = self.fitness_cache.get(key)
+            if cached and _cacheable(cached["fitness"], cached["stats"]):
+                genome.fitness, genome.stats = cached["fitness"], dict(cached["stats"])
+            else:
+                by_key.setdefault(key, []).append(genome)
+
+        # One representative per distinct strategy
+        to_run = [group[0] for group in by_key.values()]
+        if self.evaluator:
+            self.evaluator.evaluate(to_run)
+        else:
+            for genome in to_run:
+                evaluate_fitness(genome, self.data)
+
+        for key, (first, *duplicates) in by_key.items():
+            if _cacheable(first.fitness, first.stats):
+                self.fitness_cache.put(key, first.fitness, first.stats)
+            for genome in duplicates:
+                genome.fitness, genome.stats = first.fitness, first.stats
+        self.fitness_cache.save()
+        print(f"Fitness cache: {self.fitness_cache.stats()}")
@@ -1,8 +1,19 @@
 from backtesting import Backtest, Strategy
 from backtesting.lib import crossover
 import pandas as pd
+import hashlib
 import sys
 import types
+from functools import lru_cache
+
+from .indicators import EMA, SMA, STD
+from .vectorized import backtest_crossover, match_crossover
+
+CASH = 10000
+COMMISSION = .002
+
+# stats["Error"] of failures that depend only on the code, so they repeat on every run
+DETERMINISTIC_ERRORS = ("compile", "no_strategy")
 
 # Ensure necessary imports are available for the dynamic code
 # The strategies will assume these are imported
@@ -10,6 +21,10 @@ SAFE_GLOBALS = {
     'Strategy': Strategy,
     'crossover': crossover,
     'pd': pd,
+    # Cached indicators, shared by every genome in the process
+    'SMA': SMA,
+    'EMA': EMA,
+    'STD': STD,
     'abs': abs,
     'min': min,
     'max': max,
@@ -17,44 +32,66 @@ SAFE_GLOBALS = {
     'len': len
 }
 
+@lru_cache(maxsize=1024)
+def compile_strategy(code):
+    """
+    Compiles and executes the genome code once per distinct source and
+    returns its Strategy subclass, or None if it defines none.
+    The class is shared by every later backtest of the same code.
+    """
+    module_name = f"strategy_{hashlib.sha1(code.encode()).hexdigest()[:12]}"
+    dynamic_module = types.ModuleType(module_name)
+
+    # Execute code in the module's namespace
+    # WARNING: exec() is dangerous if code comes from untrusted sources.
+    # Run LLM-generated genomes in the sandboxed workers of evolution.parallel.
+    exec(compile(code, module_name, "exec"), SAFE_GLOBALS, dynamic_module.__dict__)
+
+    # Find the strategy class (must inherit from Strategy)
+    for name, obj in dynamic_module.__dict__.items():
+        if isinstance(obj, type) and issubclass(obj, Strategy) and obj is not Strategy:
+            return obj
+    return None
+
+
 def evaluate_fitness(genome, data):
     """
     Compiles the genome code and runs a backtest.
     Returns: Sharpe Ratio (float).
     """
     code = genome.code
+
+    # Fast path: SMA crossover genomes with only their windows changed
+    params = match_crossover(code)
+    if params is not None:
+        stats = backtest_crossover(data, *params, cash=CASH, commission=COMMISSION)
+        if stats is not None:
+            genome.stats = stats
+            sharpe = stats['Sharpe Ratio']
+            if pd.isna(sharpe):
+                sharpe = 0.0
+            genome.fitness = sharpe
+            return sharpe
     
-    # 1. Dynamic Compilation
+    # 1. Dynamic Compilation (cached per distinct source)
     try:
-        # Create a new module to hold the strategy execution
-        module_name = f"strategy_{genome.id}"
-        dynamic_module = types.ModuleType(module_name)
-        
-        # Execute code in the module's namespace
-        # WARNING: exec() is dangerous if code comes from untrusted sources.
-        # Here we assume the "Generative Model" is the source.
-        exec(code, SAFE_GLOBALS, dynamic_module.__dict__)
-        
-        # Find the strategy class (must inherit from Strategy)
-        strategy_class = None
-        for name, obj in dynamic_module.__dict__.items():
-            if isinstance(obj, type) and issubclass(obj, Strategy) and obj is not Strategy:
-                strategy_class = obj
-                break
-        
+        strategy_class = compile_strategy(code)
         if not strategy_class:
             print(f"Genome {genome.id}: No valid Strategy class found.")
+            genome.stats = {"Error": "no_strategy"}
             genome.fitness = -999
             return -999
 
     except Exception as e:
         print(f"Genome {genome.id}: Compilation/Execution Error: {e}")
+        # Module-level code can also time out or run out of memory
+        genome.stats = {"Error": type(e).__name__ if isinstance(e, (TimeoutError, MemoryError)) else "compile"}
         genome.fitness = -999
         return -999
 
     # 2. Run Backtest
     try:
-        bt = Backtest(data, strategy_class, cash=10000, commission=.002)
+        bt = Backtest(data, strategy_class, cash=CASH, commission=COMMISSION)
         stats = bt.run()
         
         # Store full stats in genome for analysis
@@ -71,5 +108,6 @@ def evaluate_fitness(genome, data):
 
     except Exception as e:
         print(f"Genome {genome.id}: Backtest Runtime Error: {e}")
+        genome.stats = {"Error": type(e).__name__}
         genome.fitness = -999
         return -999
@@ -0,0 +1,100 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+
+def array_fingerprint(values):
+    """Content hash of a price series, so copies of the same data share entries."""
+    values = np.ascontiguousarray(values, dtype=float)
+    return hashlib.blake2b(values.tobytes(), digest_size=16).hexdigest()
+
+
+class IndicatorCache:
+    """
+    LRU cache of indicator arrays keyed on (name, params, data fingerprint).
+
+    Every genome in a population runs on the same price series, so an
+    (indicator, window) pair is computed once per process and shared by
+    every strategy that asks for it. Cached arrays are read-only, and the
+    cache holds at most max_bytes of them.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, name, params, values, compute):
+        """Cached compute(values, *params), computing it on a miss."""
+        key = (name, params, array_fingerprint(values))
+        with self._lock:
+            result = self.entries.get(key)
+            if result is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return result
+            self.misses += 1
+
+        result = np.asarray(compute(np.asarray(values, dtype=float), *params), dtype=float)
+        result.setflags(write=False)
+        with self._lock:
+            if key not in self.entries:
+                self.entries[key] = result
+                self.nbytes += result.nbytes
+            while self.nbytes > self.max_bytes and self.entries:
+                _, evicted = self.entries.popitem(last=False)
+                self.nbytes -= evicted.nbytes
+        return result
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self.entries),
+                "bytes": self.nbytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+            self.nbytes = 0
+
+
+# Shared by every strategy evaluated in this process
+INDICATORS = IndicatorCache()
+
+
+def _sma(values, n):
+    return pd.Series(values).rolling(n).mean().to_numpy()
+
+
+def _ema(values, n):
+    return pd.Series(values).ewm(span=n, adjust=False).mean().to_numpy()
+
+
+def _std(values, n):
+    return pd.Series(values).rolling(n).std().to_numpy()
+
+
+def SMA(values, n):
+    """Simple moving average over n bars."""
+    return INDICATORS.get("SMA", (int(n),), values, _sma)
+
+
+def EMA(values, n):
+    """Exponential moving average with span n."""
+    return INDICATORS.get("EMA", (int(n),), values, _ema)
+
+
+def STD(values, n):
+    """Rolling standard deviation over n bars."""
+    return INDICATORS.get("STD", (int(n),), values, _std)
@@ -0,0 +1,172 @@
+import resource
+import signal
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+
+from .genome import StrategyGenome
+from .fitness import evaluate_fitness
+
+# OHLCV DataFrame of this worker process, set once by _init_worker
+_DATA = None
+
+
+def _init_worker(data, memory_limit=None):
+    global _DATA
+    _DATA = data
+    if memory_limit:
+        # Genome code that allocates past the limit gets a MemoryError instead of taking the host down
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+
+
+@contextmanager
+def _time_limit(seconds):
+    # SIGALRM interrupts the backtest loop in the worker's main thread
+    def on_alarm(signum, frame):
+        raise TimeoutError(f"Fitness evaluation exceeded {seconds}s")
+
+    previous = signal.signal(signal.SIGALRM, on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+@contextmanager
+def _cpu_limit(seconds):
+    # Soft RLIMIT_CPU at this worker's CPU time so far plus the task's budget;
+    # the kernel sends SIGXCPU once it is crossed, even if SIGALRM is starved
+    def on_xcpu(signum, frame):
+        raise TimeoutError(f"Fitness evaluation exceeded {seconds}s of CPU")
+
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    soft = int(usage.ru_utime + usage.ru_stime + seconds) + 1
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    previous = signal.signal(signal.SIGXCPU, on_xcpu)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+    try:
+        yield
+    finally:
+        resource.setrlimit(resource.RLIMIT_CPU, (hard, hard))
+        signal.signal(signal.SIGXCPU, previous)
+
+
+def _evaluate_in_worker(genome_id, code, timeout):
+    genome = StrategyGenome(code)
+    genome.id = genome_id
+    try:
+        with _time_limit(timeout), _cpu_limit(timeout):
+            evaluate_fitness(genome, _DATA)
+    except TimeoutError as e:
+        print(f"Genome {genome_id}: {e}")
+        genome.stats = {"Error": "TimeoutError"}
+        genome.fitness = -999
+    # The strategy instance belongs to a class exec'd in this process and cannot be pickled
+    stats = {k: v for k, v in genome.stats.items() if k != '_strategy'}
+    return genome.fitness, stats
+
+
+class ParallelEvaluator:
+    """
+    Evaluates genomes on a pool of long-lived, sandboxed worker processes.
+
+    The data is handed to each worker once, when the pool starts (inherited
+    on fork), so only genome code travels per task. Workers persist across
+    generations, keeping their compiled strategies and indicator caches.
+    Each worker's address space is capped at memory_limit bytes (None for
+    no cap), and each genome gets timeout seconds of wall and CPU time:
+    past that it scores -999, and if the worker does not recover within a
+    grace period the pool is killed and restarted.
+    """
+
+    def __init__(self, data, workers=None, timeout=60, grace=5, memory_limit=4 * 1024 ** 3):
+        self.data = data
+        self.workers = workers
+        self.timeout = timeout
+        self.grace = grace
+        self.memory_limit = memory_limit
+        self._pool = None
+
+    def _get_pool(self):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker, initargs=(self.data, self.memory_limit))
+        return self._pool
+
+    def evaluate(self, genomes):
+        """Sets fitness and stats on every genome, in place."""
+        unfinished, reason = self._run(genomes)
+        # A dead or hung worker takes every genome in flight down with it, so
+        # those are rerun one at a time and only the culprit scores -999
+        for genome in unfinished:
+            if self._run([genome])[0]:
+                print(f"Genome {genome.id}: worker {reason}, scored -999")
+                genome.stats = {"Error": f"worker {reason}"}
+                genome.fitness = -999
+
+    def _run(self, genomes):
+        # Returns the genomes left without a result when a worker died or hung, and why
+        pool = self._get_pool()
+        futures = [(genome, pool.submit(_evaluate_in_worker, genome.id, genome.code, self.timeout)) for genome in genomes]
+        for i, (genome, future) in enumerate(futures):
+            try:
+                genome.fitness, genome.stats = future.result(timeout=self.timeout + self.grace)
+            except (FutureTimeout, BrokenProcessPool) as e:
+                reason = "unresponsive" if isinstance(e, FutureTimeout) else "died"
+                print(f"Worker {reason}, restarting pool")
+                self._kill_pool()
+                # Results that arrived before the pool went down are kept
+                unfinished = [genome]
+                for g, f in futures[i + 1:]:
+                    if f.done() and not f.cancelled() and f.exception() is None:
+                        g.fitness, g.stats = f.result()
+                    else:
+                        unfinished.append(g)
+                return unfinished, reason
+            except Exception as e:
+                print(f"Genome {genome.id}: Worker Error: {e}")
+                genome.stats = {"Error": type(e).__name__}
+                genome.fitness = -999
+        return [], None
+
+    def _kill_pool(self):
+        for process in list((self._pool._processes or {}).values()):
+            process.kill()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self._pool = None
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+
+if __name__ == "__main__":
+    # Worker-death check: only the genome that kills its worker scores -999
+    import numpy as np
+    import pandas as pd
+
+    prices = 100 + np.cumsum(np.random.default_rng(0).normal(0, 1, 300))
+    data = pd.DataFrame({"Open": prices, "High": prices + 1, "Low": prices - 1, "Close": prices, "Volume": 1000},
+                        index=pd.date_range("2020-01-01", periods=len(prices), freq="D"))
+    strategy = """
+class Hold(Strategy):
+    n = {n}
+
+    def init(self):
+        {body}
+
+    def next(self):
+        if len(self.data) > self.n and not self.position:
+            self.buy()
+"""
+    genomes = [StrategyGenome(strategy.format(n=n, body=body)) for n, body in
+               [(5, "pass"), (10, "import os; os._exit(1)"), (15, "pass"), (20, "pass")]]
+    evaluator = ParallelEvaluator(data, workers=2, timeout=10)
+    evaluator.evaluate(genomes)
+    evaluator.close()
+    print([genome.fitness for genome in genomes])
+    assert [genome.fitness == -999 for genome in genomes] == [False, True, False, False]
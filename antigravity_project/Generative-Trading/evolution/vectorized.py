@@ -0,0 +1,231 @@
+import ast
+import sys
+import weakref
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from .indicators import SMA
+
+# backtesting.py sizes "buy everything" orders with this fraction of equity
+_FULL_EQUITY = 1 - sys.float_info.epsilon
+
+# The SMA crossover seed of evolve.py, before and after it moved to the cached SMA;
+# genomes equal to either up to n1/n2 take the fast path
+CROSSOVER_TEMPLATES = ("""
+from backtesting import Strategy
+from backtesting.lib import crossover
+import pandas as pd
+
+class CrossoverStrategy(Strategy):
+    n1 = 10
+    n2 = 20
+
+    def init(self):
+        close = self.data.Close
+        self.sma1 = self.I(lambda x: pd.Series(x).rolling(self.n1).mean(), close)
+        self.sma2 = self.I(lambda x: pd.Series(x).rolling(self.n2).mean(), close)
+
+    def next(self):
+        if crossover(self.sma1, self.sma2):
+            self.buy()
+        elif crossover(self.sma2, self.sma1):
+            self.position.close()
+""", """
+from backtesting import Strategy
+from backtesting.lib import crossover
+import pandas as pd
+from evolution.indicators import SMA
+
+class CrossoverStrategy(Strategy):
+    n1 = 10
+    n2 = 20
+
+    def init(self):
+        close = self.data.Close
+        self.sma1 = self.I(SMA, close, self.n1)
+        self.sma2 = self.I(SMA, close, self.n2)
+
+    def next(self):
+        if crossover(self.sma1, self.sma2):
+            self.buy()
+        elif crossover(self.sma2, self.sma1):
+            self.position.close()
+""")
+
+_PARAMS = ("n1", "n2")
+
+
+def _strip_params(tree):
+    # Returns {name: value} of the class-level integer parameters, zeroing them in tree
+    params = {}
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.ClassDef):
+            continue
+        for stmt in node.body:
+            if (isinstance(stmt, ast.Assign) and len(stmt.targets) == 1 and isinstance(stmt.targets[0], ast.Name)
+                    and stmt.targets[0].id in _PARAMS and isinstance(stmt.value, ast.Constant) and type(stmt.value.value) is int):
+                params[stmt.targets[0].id] = stmt.value.value
+                stmt.value.value = 0
+    return params
+
+
+@lru_cache(maxsize=None)
+def _template_dumps():
+    dumps = set()
+    for template in CROSSOVER_TEMPLATES:
+        tree = ast.parse(template)
+        _strip_params(tree)
+        dumps.add(ast.dump(tree))
+    return frozenset(dumps)
+
+
+def match_crossover(code):
+    """(n1, n2) if code is a CROSSOVER_TEMPLATES entry with other window lengths, else None."""
+    try:
+        tree = ast.parse(code)
+    except SyntaxError:
+        return None
+    params = _strip_params(tree)
+    if set(params) != set(_PARAMS) or ast.dump(tree) not in _template_dumps():
+        return None
+    return params["n1"], params["n2"]
+
+
+_PREPARED = {}
+
+
+def _prepare(data):
+    # Price arrays and calendar of a DataFrame, computed once while it is alive
+    key = id(data)
+    if key not in _PREPARED:
+        close = data.Close.to_numpy(dtype=float)
+        _PREPARED[key] = {
+            "opens": data.Open.to_numpy(dtype=float).tolist(),
+            "closes": close,
+            "annual_trading_days": daily_calendar(data),
+        }
+        weakref.finalize(data, _PREPARED.pop, key, None)
+    return _PREPARED[key]
+
+
+def backtest_signals(data, entries, exits, cash=10000, commission=.002):
+    """
+    Long-only backtest of boolean signal arrays with backtesting.py's
+    semantics: a signal on bar i fills at the open of bar i + 1, entries
+    buy as many whole units as the free cash allows, exits close the whole
+    position, and open trades stay open at the end.
+    Returns (equity curve, closed trades as (size, entry bar, exit bar, entry price, exit price)).
+    """
+    prepared = _prepare(data)
+    opens, closes = prepared["opens"], prepared["closes"]
+    n = len(closes)
+    trades = [] # Open (size, entry bar, entry price)
+    closed = []
+    cash, size, cost = float(cash), 0.0, 0.0
+    # Account state from each fill bar on: equity = cash + size * close - cost
+    fill_bars, states = [0], [(cash, size, cost)]
+
+    # Signals on the last bar never fill
+    for i in np.flatnonzero((entries | exits)[:n - 1]).tolist():
+        k = i + 1
+        price = opens[k]
+        if entries[i]:
+            margin_available = max(0.0, cash - cost)
+            units = int((margin_available * _FULL_EQUITY) // (price + (_FULL_EQUITY * price * commission) / _FULL_EQUITY))
+            if not units:
+                continue
+            cash -= units * price * commission
+            trades.append((units, k, price))
+            size += units
+            cost += units * price
+        elif trades:
+            for units, entry_bar, entry_price in trades:
+                cash += units * (price - entry_price) - units * price * commission
+                closed.append((units, entry_bar, k, entry_price, price))
+            trades = []
+            size = cost = 0.0
+        else:
+            continue
+        fill_bars.append(k)
+        states.append((cash, size, cost))
+
+    state = np.array(states)[np.repeat(np.arange(len(fill_bars)), np.diff(fill_bars + [n]))]
+    equity = state[:, 0] + state[:, 1] * closes - state[:, 2]
+    return equity, closed
+
+
+def _geometric_mean(returns):
+    returns = np.nan_to_num(returns) + 1
+    if np.any(returns <= 0):
+        return 0
+    return np.exp(np.log(returns).sum() / (len(returns) or np.nan)) - 1
+
+
+_DAY = 86400 * 10**9
+
+
+def daily_calendar(data):
+    """
+    Trading days per year for daily bars (at most one per calendar day),
+    as backtesting.py infers it, or None for any other index.
+    """
+    index = data.index
+    if not isinstance(index, pd.DatetimeIndex) or len(index) < 3 or index.tz is not None:
+        return None
+    stamps = index.as_unit('ns').asi8
+    steps = np.diff(stamps)
+    if (stamps % _DAY).any() or (steps <= 0).any() or np.median(steps) != _DAY:
+        return None
+    weekday = (stamps // _DAY + 3) % 7 # 1970-01-01 was a Thursday
+    have_weekends = (weekday >= 5).mean() > 2 / 7 * .6
+    return 365 if have_weekends else 252
+
+
+def compute_stats(data, equity, closed, commission=.002, annual_trading_days=365):
+    """The headline backtesting.py stats, Sharpe Ratio computed the same way (daily bars)."""
+    # One bar per day, so resampling to days leaves the equity curve as is
+    day_returns = np.diff(equity) / equity[:-1]
+    gmean_day_return = _geometric_mean(day_returns)
+    annualized_return = (1 + gmean_day_return) ** annual_trading_days - 1
+    volatility = np.sqrt((day_returns.var(ddof=1) + (1 + gmean_day_return) ** 2) ** annual_trading_days - (1 + gmean_day_return) ** (2 * annual_trading_days))
+    drawdown = 1 - equity / np.maximum.accumulate(equity)
+    pnl = np.array([units * (exit_price - entry_price) - units * (entry_price + exit_price) * commission for units, _, _, entry_price, exit_price in closed])
+    return {
+        "Equity Final [$]": equity[-1],
+        "Equity Peak [$]": equity.max(),
+        "Return [%]": (equity[-1] - equity[0]) / equity[0] * 100,
+        "Return (Ann.) [%]": annualized_return * 100,
+        "Volatility (Ann.) [%]": volatility * 100,
+        "Sharpe Ratio": annualized_return * 100 / (volatility * 100 or np.nan),
+        "Max. Drawdown [%]": -np.nan_to_num(drawdown.max()) * 100,
+        "# Trades": len(closed),
+        "Win Rate [%]": (pnl > 0).mean() * 100 if len(closed) else np.nan,
+        "Engine": "vectorized",
+    }
+
+
+def crossover_signals(data, n1, n2):
+    """Entry/exit arrays of the SMA crossover, with backtesting.py's warm-up."""
+    close = _prepare(data)["closes"]
+    sma1, sma2 = SMA(close, n1), SMA(close, n2)
+    with np.errstate(invalid='ignore'):
+        up = np.zeros(len(close), dtype=bool)
+        down = np.zeros(len(close), dtype=bool)
+        up[1:] = (sma1[:-1] < sma2[:-1]) & (sma1[1:] > sma2[1:])
+        down[1:] = (sma2[:-1] < sma1[:-1]) & (sma2[1:] > sma1[1:])
+    # Strategy.next first runs once every indicator has a value
+    start = max(n1, n2)
+    up[:start] = down[:start] = False
+    return up, down & ~up
+
+
+def backtest_crossover(data, n1, n2, cash=10000, commission=.002):
+    """Stats dict for the SMA crossover genome, or None if it needs the full engine."""
+    annual_trading_days = _prepare(data)["annual_trading_days"]
+    if annual_trading_days is None or max(n1, n2) >= len(data) or min(n1, n2) < 1:
+        return None
+    entries, exits = crossover_signals(data, n1, n2)
+    equity, closed = backtest_signals(data, entries, exits, cash, commission)
+    return compute_stats(data, equity, closed, commission, annual_trading_days)
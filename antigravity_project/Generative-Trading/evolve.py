@@ -4,14 +4,17 @@ if not hasattr(np, 'bool8'):
     np.bool8 = np.bool
 
 import argparse
+import os
 from utils import get_crypto_data
 from evolution.engine import EvolutionEngine
 
-# A simple seed strategy to start the evolution
+# A simple seed strategy to start the evolution.
+# SMA is the cached indicator shared by every genome in a run.
 SEED_STRATEGY = """
 from backtesting import Strategy
 from backtesting.lib import crossover
 import pandas as pd
+from evolution.indicators import SMA
 
 class CrossoverStrategy(Strategy):
     n1 = 10
@@ -19,8 +22,8 @@ class CrossoverStrategy(Strategy):
 
     def init(self):
         close = self.data.Close
-        self.sma1 = self.I(lambda x: pd.Series(x).rolling(self.n1).mean(), close)
-        self.sma2 = self.I(lambda x: pd.Series(x).rolling(self.n2).mean(), close)
+        self.sma1 = self.I(SMA, close, self.n1)
+        self.sma2 = self.I(SMA, close, self.n2)
 
     def next(self):
         if crossover(self.sma1, self.sma2):
@@ -34,6 +37,9 @@ def main():
     parser.add_argument("--symbol", default="BTC-USD", help="Crypto symbol to trade")
     parser.add_argument("--gens", type=int, default=5, help="Number of generations")
     parser.add_argument("--pop", type=int, default=10, help="Population size")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Sandboxed fitness worker processes (0 = evaluate in this process, unsandboxed)")
+    parser.add_argument("--timeout", type=float, default=60, help="Seconds allowed per genome backtest")
+    parser.add_argument("--cache", default="fitness_cache.json", help="Fitness cache file, reused across runs")
     
     args = parser.parse_args()
     
@@ -46,7 +52,7 @@ def main():
         return
 
     # 2. Initialize Engine
-    engine = EvolutionEngine(data, population_size=args.pop)
+    engine = EvolutionEngine(data, population_size=args.pop, workers=args.workers, timeout=args.timeout, cache_path=args.cache)
     engine.initialize_population([SEED_STRATEGY])
     
     # 3. Evolution Loop
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+
+from evolution.cache import FitnessCache, data_fingerprint, normalize_code
+
+CODE = """
+class S:
+    n1 = 10
+    def next(self):
+        return self.n1
+"""
+
+
+def prices(seed=0, days=50):
+    rng = np.random.default_rng(seed)
+    close = 100 + rng.standard_normal(days).cumsum()
+    return pd.DataFrame({"Open": close, "High": close + 1, "Low": close - 1, "Close": close},
+                        index=pd.date_range("2021-01-01", periods=days))
+
+
+def test_normalize_code_ignores_formatting_and_comments():
+    reformatted = "# A comment\nclass S:\n\n    n1 = (10)  # window\n    def next(self): return self.n1\n"
+    assert normalize_code(reformatted) == normalize_code(CODE)
+    assert normalize_code(CODE.replace("10", "11")) != normalize_code(CODE)
+
+
+def test_normalize_code_keeps_invalid_code():
+    assert normalize_code("class S(:") == "class S(:"
+
+
+def test_data_fingerprint():
+    data = prices()
+    assert data_fingerprint(data) == data_fingerprint(data.copy())
+    changed = data.copy()
+    changed.iloc[10, 3] += 0.01
+    assert data_fingerprint(changed) != data_fingerprint(data)
+    assert data_fingerprint(data.rename(columns={"Close": "Adj Close"})) != data_fingerprint(data)
+
+
+def test_key():
+    cache = FitnessCache()
+    fingerprint = data_fingerprint(prices())
+    assert cache.key(CODE, fingerprint) == cache.key(CODE.replace("    ", "  "), fingerprint)
+    assert cache.key(CODE, fingerprint) != cache.key(CODE, data_fingerprint(prices(seed=1)))
+
+
+def test_hits_and_misses():
+    cache = FitnessCache()
+    key = cache.key(CODE, "data")
+    assert cache.get(key) is None
+    cache.put(key, np.float64(1.5), {"Sharpe Ratio": np.float64(1.5), "# Trades": np.int64(3), "_trades": object()})
+    assert cache.get(key) == {"fitness": 1.5, "stats": {"Sharpe Ratio": 1.5, "# Trades": 3}}
+    assert cache.stats() == {"size": 1, "hits": 1, "misses": 1, "hit_rate": 0.5}
+
+
+def test_save_and_load(tmp_path):
+    path = tmp_path / "fitness_cache.json"
+    cache = FitnessCache(path)
+    key = cache.key(CODE, "data")
+    cache.put(key, 0.7, {"Duration": pd.Timedelta(days=3), "Start": pd.Timestamp("2021-01-01")})
+    cache.save()
+    assert not (tmp_path / "fitness_cache.json.tmp").exists()
+
+    restored = FitnessCache(path)
+    assert restored.entries == cache.entries
+    assert restored.get(key)["stats"] == {"Duration": "3 days 00:00:00", "Start": "2021-01-01 00:00:00"}
@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from evolution.vectorized import CROSSOVER_TEMPLATES, backtest_crossover, backtest_signals, match_crossover
+
+STATS = ["Equity Final [$]", "Equity Peak [$]", "Return [%]", "Return (Ann.) [%]", "Volatility (Ann.) [%]",
+         "Sharpe Ratio", "Max. Drawdown [%]", "# Trades", "Win Rate [%]"]
+
+
+def random_walk(seed, days=400):
+    # Daily OHLC bars, weekends included like crypto data
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(rng.normal(0, 0.03, days).cumsum())
+    open_ = np.r_[100, close[:-1]] * np.exp(rng.normal(0, 0.005, days))
+    return pd.DataFrame({
+        "Open": open_,
+        "High": np.maximum(open_, close) * 1.01,
+        "Low": np.minimum(open_, close) * 0.99,
+        "Close": close,
+        "Volume": 1000.0,
+    }, index=pd.date_range("2021-01-01", periods=days))
+
+
+@pytest.mark.parametrize("template", CROSSOVER_TEMPLATES)
+def test_match_crossover(template):
+    assert match_crossover(template) == (10, 20)
+    code = template.replace("n1 = 10", "n1 = 7").replace("n2 = 20", "n2 = 42")
+    assert match_crossover(code) == (7, 42)
+    assert match_crossover("# Reformatted\n" + code.replace("    ", "\t")) == (7, 42)
+
+
+@pytest.mark.parametrize("template", CROSSOVER_TEMPLATES)
+def test_match_crossover_rejects_other_code(template):
+    assert match_crossover(template.replace("self.buy()", "self.sell()")) is None
+    assert match_crossover(template.replace("n2 = 20", "n2 = 20.5")) is None
+    assert match_crossover(template.replace("    n2 = 20\n", "")) is None
+    assert match_crossover(template + "\nx = (") is None
+
+
+def test_backtest_signals():
+    data = pd.DataFrame({"Open": [10.0, 20.0, 30.0, 40.0], "Close": [15.0, 25.0, 35.0, 45.0]})
+    entries = np.array([True, False, False, True])
+    exits = np.array([False, True, False, False])
+    equity, closed = backtest_signals(data, entries, exits, cash=1000, commission=0)
+    # Buys 49 units at the next open (50 would spend the whole cash), sells them at the open after
+    # the exit; the entry on the last bar never fills
+    assert closed == [(49, 1, 2, 20.0, 30.0)]
+    np.testing.assert_allclose(equity, [1000, 1000 + 49 * (25 - 20), 1490, 1490])
+
+
+def test_backtest_signals_commission():
+    data = pd.DataFrame({"Open": [10.0, 10.0, 10.0], "Close": [10.0, 10.0, 10.0]})
+    equity, closed = backtest_signals(data, np.array([True, False, False]), np.array([False, True, False]),
+                                      cash=1000, commission=.01)
+    # 99 units at 10.1 each with the 1% commission; 100 would need 1010
+    assert closed == [(99, 1, 2, 10.0, 10.0)]
+    np.testing.assert_allclose(equity, [1000, 1000 - 9.9, 1000 - 2 * 9.9])
+
+
+@pytest.mark.filterwarnings("ignore:Some trades remain open")
+@pytest.mark.parametrize("seed", [0, 1, 2])
+@pytest.mark.parametrize("n1, n2", [(10, 20), (5, 50), (30, 8)])
+def test_backtest_crossover_matches_backtesting(seed, n1, n2):
+    pytest.importorskip("backtesting")
+    if not hasattr(np, 'bool8'):
+        np.bool8 = np.bool
+    from backtesting import Backtest
+    from evolution.fitness import CASH, COMMISSION, compile_strategy
+
+    data = random_walk(seed)
+    code = CROSSOVER_TEMPLATES[1].replace("n1 = 10", f"n1 = {n1}").replace("n2 = 20", f"n2 = {n2}")
+    expected = Backtest(data, compile_strategy(code), cash=CASH, commission=COMMISSION).run()
+    stats = backtest_crossover(data, n1, n2, cash=CASH, commission=COMMISSION)
+    assert stats["# Trades"] > 0
+    for name in STATS:
+        assert stats[name] == pytest.approx(expected[name], rel=1e-9, nan_ok=True), name
+
+
+def test_backtest_crossover_needs_daily_bars():
+    hourly = random_walk(0).set_axis(pd.date_range("2021-01-01", periods=400, freq="h"))
+    assert backtest_crossover(hourly, 10, 20) is None
+    assert backtest_crossover(random_walk(0, days=20), 10, 20) is None
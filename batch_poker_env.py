@@ -0,0 +1,321 @@
+import random
+import numpy as np
+from treys import Deck
+
+from poker_env import PokerEnv
+from hand_eval import LookupEvaluator, WORST_RANK
+
+# Action codes for BatchPokerEnv.step
+FOLD, CALL, RAISE = 0, 1, 2
+ACTION_CODES = {'fold': FOLD, 'call': CALL, 'raise': RAISE}
+
+# Per-table status returned by BatchPokerEnv.step
+PLAYING, HAND_OVER, GAME_OVER = 0, 1, 2
+
+STAGES = ('PREFLOP', 'FLOP', 'TURN', 'RIVER')
+PREFLOP, FLOP, TURN, RIVER = range(4)
+
+FULL_DECK = np.array(Deck.GetFullDeck(), dtype=np.int32)
+
+
+class BatchPokerEnv:
+    """
+    N independent PokerEnv tables held in NumPy arrays.
+
+    Follows the same rules as PokerEnv (blinds, simplified min raise,
+    round completion, winner-take-all showdown) but advances every table
+    with a single step(actions, amounts) call. Hands that finish are
+    re-dealt automatically, like PokerEnv.step does.
+    """
+
+    def __init__(self, num_tables=1024, num_players=3, starting_stack=500, small_blind=10, ante=0, seed=None, evaluator=None):
+        self.num_tables = num_tables
+        self.num_players = num_players
+        self.starting_stack = starting_stack
+        self.small_blind = small_blind
+        self.big_blind = small_blind * 2
+        self.ante = ante
+
+        self.evaluator = evaluator or LookupEvaluator()
+        self.rng = np.random.default_rng(seed)
+        self.reset_tournament()
+
+    def reset_tournament(self):
+        n, p = self.num_tables, self.num_players
+        self.stacks = np.full((n, p), self.starting_stack, dtype=np.int64)
+        self.bets = np.zeros((n, p), dtype=np.int64)
+        self.active = np.ones((n, p), dtype=bool)
+        self.folded = np.zeros((n, p), dtype=bool)
+        self.all_in = np.zeros((n, p), dtype=bool)
+        self.hands = np.zeros((n, p, 2), dtype=np.int32)
+
+        self.pot = np.zeros(n, dtype=np.int64)
+        self.current_bet = np.zeros(n, dtype=np.int64)
+        self.stage = np.zeros(n, dtype=np.int8)
+        self.community = np.zeros((n, 5), dtype=np.int32)
+        self.num_community = np.zeros(n, dtype=np.int8)
+        self.deck = np.zeros((n, 52), dtype=np.int32) # Cards in draw order
+        self.deck_pos = np.zeros(n, dtype=np.int16)
+
+        self.blind_level = np.zeros(n, dtype=np.int16)
+        self.dealer_pos = np.zeros(n, dtype=np.int16)
+        self.active_iter_idx = np.zeros(n, dtype=np.int16)
+        self.game_over = np.zeros(n, dtype=bool)
+
+        self.reset_hand(np.ones(n, dtype=bool))
+
+    def reset_hand(self, mask):
+        """
+        Deals a new hand on every table in mask.
+        Tables with one player left are flagged in self.game_over instead.
+        """
+        over = mask & ((self.stacks > 0).sum(axis=1) <= 1)
+        self.game_over |= over
+        t = np.flatnonzero(mask & ~over)
+        if len(t) == 0:
+            return
+
+        self.pot[t] = 0
+        self.current_bet[t] = 0
+        self.community[t] = 0
+        self.num_community[t] = 0
+        self.bets[t] = 0
+        self.folded[t] = False
+        self.all_in[t] = False
+        self.active[t] = self.stacks[t] > 0
+
+        # Shuffle a fresh deck per table
+        self.deck[t] = self.rng.permuted(np.broadcast_to(FULL_DECK, (len(t), 52)), axis=1)
+
+        # Deal two cards to each active player in seat order
+        active = self.active[t]
+        rank = np.cumsum(active, axis=1) - 1
+        hole = 2 * np.where(active, rank, 0)
+        self.hands[t, :, 0] = np.where(active, self.deck[t[:, None], hole], 0)
+        self.hands[t, :, 1] = np.where(active, self.deck[t[:, None], hole + 1], 0)
+        num_active = active.sum(axis=1)
+        self.deck_pos[t] = 2 * num_active
+
+        # Blinds rotate over active players, starting after the dealer
+        dealer = self.dealer_pos[t]
+        dealer_active = active[np.arange(len(t)), dealer]
+        dealer_active_idx = np.where(dealer_active, rank[np.arange(len(t)), dealer], 0)
+        sb_active_idx = (dealer_active_idx + 1) % num_active
+        bb_active_idx = (dealer_active_idx + 2) % num_active
+        sb_pos = self._seat_of(active, sb_active_idx)
+        bb_pos = self._seat_of(active, bb_active_idx)
+
+        # Antes go straight to the pot, outside the betting round
+        if self.ante:
+            ante = np.where(active, np.minimum(self.stacks[t], self.ante), 0)
+            self.stacks[t] -= ante
+            self.pot[t] += ante.sum(axis=1)
+            self.all_in[t] |= active & (self.stacks[t] == 0)
+
+        self._post_bet(t, sb_pos, np.full(len(t), self.small_blind))
+        self._post_bet(t, bb_pos, np.full(len(t), self.big_blind))
+
+        self.current_bet[t] = self.big_blind
+        self.active_iter_idx[t] = (bb_active_idx + 1) % num_active
+        self.stage[t] = PREFLOP
+
+    @staticmethod
+    def _seat_of(active, active_idx):
+        # Seat index of the active_idx-th active player on each table
+        rank = np.cumsum(active, axis=1) - 1
+        return np.argmax(active & (rank == active_idx[:, None]), axis=1)
+
+    def _post_bet(self, t, seat, amount):
+        actual = np.minimum(self.stacks[t, seat], amount)
+        self.stacks[t, seat] -= actual
+        self.bets[t, seat] += actual
+        self.pot[t] += actual
+        self.all_in[t, seat] |= self.stacks[t, seat] == 0
+        return actual
+
+    def current_player(self):
+        """Seat index of the player to act on each table."""
+        return self._seat_of(self.active, self.active_iter_idx)
+
+    def step(self, actions, amounts=None):
+        """
+        actions: int array of FOLD/CALL/RAISE, one per table
+        amounts: raise amounts (total bet amount, not increment)
+        Returns an int array of PLAYING/HAND_OVER/GAME_OVER per table.
+        """
+        actions = np.asarray(actions)
+        amounts = np.zeros(self.num_tables, dtype=np.int64) if amounts is None else np.asarray(amounts, dtype=np.int64)
+        status = np.full(self.num_tables, PLAYING, dtype=np.int8)
+        status[self.game_over] = GAME_OVER
+
+        t = np.flatnonzero(~self.game_over)
+        a = actions[t]
+        seat = self.current_player()[t]
+        num_active = self.active[t].sum(axis=1)
+
+        # Fold: player leaves the hand
+        fold = a == FOLD
+        self.folded[t[fold], seat[fold]] = True
+        self.active[t[fold], seat[fold]] = False
+
+        # Call: match the current bet
+        call = a == CALL
+        tc, sc = t[call], seat[call]
+        self._post_bet(tc, sc, self.current_bet[tc] - self.bets[tc, sc])
+
+        # Raise: simplified min raise, raiser sets the new current bet
+        rse = a == RAISE
+        tr, sr = t[rse], seat[rse]
+        raise_amount = np.maximum(amounts[tr], self.current_bet[tr] * 2)
+        self._post_bet(tr, sr, raise_amount - self.bets[tr, sr])
+        self.current_bet[tr] = self.bets[tr, sr]
+
+        # A fold shifts the next player into the current slot
+        iter_idx = self.active_iter_idx[t]
+        next_iter_idx = np.where(fold, iter_idx % np.maximum(num_active - 1, 1), (iter_idx + 1) % num_active)
+
+        # One player left -> Winner
+        active = self.active[t]
+        last_one = active.sum(axis=1) == 1
+        tw = t[last_one]
+        winner = np.argmax(active[last_one], axis=1)
+        self.stacks[tw, winner] += self.pot[tw]
+        self.pot[tw] = 0
+
+        # Round is over when every active player matched the current bet or is all-in
+        matched = (self.all_in[t] | (self.bets[t] == self.current_bet[t, None]) | ~active).all(axis=1)
+        matched &= ~last_one
+        showdown = matched & (self.stage[t] == RIVER)
+        self._showdown(t[showdown])
+        next_street = matched & ~showdown
+        self._next_street(t[next_street])
+
+        playing = ~(last_one | matched)
+        self.active_iter_idx[t[playing]] = next_iter_idx[playing]
+
+        hand_over = np.zeros(self.num_tables, dtype=bool)
+        hand_over[t[last_one | showdown]] = True
+        self.dealer_pos[hand_over] = (self.dealer_pos[hand_over] + 1) % self.num_players
+        status[hand_over] = HAND_OVER
+        self.reset_hand(hand_over)
+        return status
+
+    def _next_street(self, t):
+        self.bets[t] = 0
+        self.current_bet[t] = 0
+        self.active_iter_idx[t] = 0 # First active seat acts, as in PokerEnv
+
+        # Flop deals three cards, turn and river one each
+        num_cards = np.where(self.stage[t] == PREFLOP, 3, 1)
+        for k in range(3):
+            deal = k < num_cards
+            td = t[deal]
+            self.community[td, self.num_community[td]] = self.deck[td, self.deck_pos[td]]
+            self.num_community[td] += 1
+            self.deck_pos[td] += 1
+        self.stage[t] += 1
+
+    def _showdown(self, t):
+        # Rank every hand still in at once; lower score is better in treys,
+        # ties go to the lowest seat
+        tt, seat = np.nonzero(self.active[t])
+        cards = np.column_stack([self.hands[t[tt], seat], self.community[t[tt]]])
+        scores = np.full((len(t), self.num_players), WORST_RANK, dtype=np.int32)
+        scores[tt, seat] = self.evaluator.evaluate_batch(cards)
+        winner = np.argmin(scores, axis=1)
+        self.stacks[t, winner] += self.pot[t]
+        self.pot[t] = 0
+
+def random_actions(rng, num_tables):
+    """Vectorized RandomAgent: uniform fold/call/raise, raise to 20-100."""
+    actions = rng.integers(0, 3, size=num_tables)
+    amounts = np.where(actions == RAISE, rng.integers(20, 101, size=num_tables), 0)
+    return actions, amounts
+
+
+class _ReplayDeck:
+    # Deals a known card order through PokerEnv's draw interface
+    def __init__(self, order):
+        self._order = [int(c) for c in reversed(order)]
+
+    def draw(self, n=1):
+        return [self._order.pop() for _ in range(n)]
+
+
+class _ReplayEnv(PokerEnv):
+    # PokerEnv that deals each hand from the matching BatchPokerEnv table
+    def __init__(self, batch, table):
+        self.batch, self.table = batch, table
+        super().__init__(num_players=batch.num_players, starting_stack=batch.starting_stack, small_blind=batch.small_blind, ante=batch.ante)
+
+    def _new_deck(self):
+        return _ReplayDeck(self.batch.deck[self.table])
+
+
+def differential_check(num_tables=200, num_steps=2000, seed=0, ante=0):
+    """
+    Plays the same decks and random actions through PokerEnv and
+    BatchPokerEnv and asserts both engines stay in the same state.
+    """
+    batch = BatchPokerEnv(num_tables=num_tables, seed=seed, ante=ante)
+    rng = random.Random(seed)
+    envs = [_ReplayEnv(batch, t) for t in range(num_tables)]
+
+    live = [True] * num_tables
+    for step in range(num_steps):
+        actions = [rng.choice(['fold', 'call', 'raise']) for _ in range(num_tables)]
+        amounts = [rng.randint(20, 100) if a == 'raise' else 0 for a in actions]
+        status = batch.step([ACTION_CODES[a] for a in actions], amounts)
+
+        for t, env in enumerate(envs):
+            if not live[t]:
+                continue
+            result, state = env.step(actions[t], amounts[t])
+            if state is None:
+                live[t] = False
+                assert batch.game_over[t], f"table {t} step {step}: PokerEnv tournament over, batch is not"
+                continue
+            assert result == ('HAND_OVER' if status[t] == HAND_OVER else 'playing'), f"table {t} step {step}: {result} vs {status[t]}"
+            _assert_same_state(env, batch, t, step)
+        if not any(live):
+            break
+    return step + 1
+
+
+def _assert_same_state(env, batch, t, step):
+    where = f"table {t} step {step}"
+    assert [p['stack'] for p in env.players] == batch.stacks[t].tolist(), where
+    assert [p['current_bet'] for p in env.players] == batch.bets[t].tolist(), where
+    assert [p['folded'] for p in env.players] == batch.folded[t].tolist(), where
+    assert [p['hand'] for p in env.players if p['active']] == batch.hands[t][batch.active[t]].tolist(), where
+    assert env.pot == batch.pot[t], where
+    assert env.current_bet == batch.current_bet[t], where
+    assert env.stage == STAGES[batch.stage[t]], where
+    assert env.community_cards == batch.community[t, :batch.num_community[t]].tolist(), where
+    assert env.dealer_pos == batch.dealer_pos[t], where
+    assert env.active_iter_idx == batch.active_iter_idx[t], where
+
+
+if __name__ == "__main__":
+    import time
+
+    steps = differential_check()
+    print(f"Differential check passed ({steps} steps x 200 tables)")
+    steps = differential_check(ante=15)
+    print(f"Differential check with antes passed ({steps} steps x 200 tables)")
+
+    env = BatchPokerEnv(num_tables=4096, seed=1)
+    rng = np.random.default_rng(1)
+    hands = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < 5:
+        status = env.step(*random_actions(rng, env.num_tables))
+        hands += int((status == HAND_OVER).sum())
+        if env.game_over.any():
+            # Restart finished tournaments so every table keeps playing
+            over = env.game_over.copy()
+            env.stacks[over] = env.starting_stack
+            env.game_over[over] = False
+            env.reset_hand(over)
+    elapsed = time.perf_counter() - start
+    print(f"{hands / elapsed * 60:,.0f} hands/minute with random actions")
@@ -0,0 +1,273 @@
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+from treys import Deck, Evaluator
+
+from agents import LLMAgent, RandomAgent
+from llm_client import LLMClient
+from poker_env import PokerEnv
+from tournament import play_match
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+
+# Speedups between metrics of the same run. Unlike raw throughput they
+# carry over between machines, so they are compared against any baseline.
+RATIOS = {
+    "lookup_vs_treys": ("showdown_lookup_per_sec", "showdown_treys_per_sec"),
+    "batch_vs_lookup": ("showdown_batch_per_sec", "showdown_lookup_per_sec"),
+    "match_vs_env": ("match_hands_per_sec", "env_hands_per_sec"),
+}
+# Memory depends on the code, not the CPU
+PORTABLE_METRICS = set(RATIOS) | {"memory_per_table_bytes"}
+
+# Higher is better for these metrics; every other metric is a latency or size
+HIGHER_IS_BETTER = {"env_hands_per_sec", "match_hands_per_sec", "showdown_treys_per_sec", "showdown_lookup_per_sec", "showdown_batch_per_sec"} | set(RATIOS)
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    # OpenAI-compatible chat endpoint standing in for LM Studio
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    delay = 0.02
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        time.sleep(self.delay)
+        content = "Reasoning: benchmark stub.\nAction: " + random.choice(["CALL", "FOLD", "RAISE 60"])
+        if request.get("stream"):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            for token in content.split(" "):
+                self.wfile.write(f"data: {json.dumps({'choices': [{'delta': {'content': token + ' '}}]})}\n\n".encode())
+                self.wfile.flush()
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.close_connection = True
+            return
+        body = json.dumps({"choices": [{"message": {"content": content}} for _ in range(request.get("n", 1))]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@contextlib.contextmanager
+def stub_llm_server(delay=0.02):
+    """Runs the stub on a free localhost port, yielding its chat completions URL."""
+    handler = type("StubHandler", (_StubHandler,), {"delay": delay})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}/v1/chat/completions"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def bench_env(num_hands=20000, seed=0):
+    """Raw PokerEnv hands/sec with uniformly random actions."""
+    rng = random.Random(seed)
+    env = PokerEnv(rng=seed)
+    env.reset_hand()
+    hands = 0
+    start = time.perf_counter()
+    while hands < num_hands:
+        action = rng.choice(('fold', 'call', 'raise'))
+        status, obs = env.step(action, rng.randint(20, 100))
+        if status == "HAND_OVER":
+            hands += 1
+            if obs is None: # One player left
+                env.reset_tournament()
+    return {"env_hands_per_sec": hands / (time.perf_counter() - start)}
+
+
+def bench_match(num_matches=50):
+    """Tournament.play_match hands/sec with three RandomAgents (event logging to a no-op)."""
+    agents = [RandomAgent(f"R{i}") for i in range(3)]
+    hands = set()
+
+    def log_event(event_type, data):
+        if event_type == "move":
+            hands.add((data["game_id"], data["hand_num"]))
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i in range(num_matches):
+            random.seed(i)
+            play_match(agents, f"bench_{i}", log_event, seed=i)
+    return {"match_hands_per_sec": len(hands) / (time.perf_counter() - start)}
+
+
+def bench_showdown(num_hands=50000, seed=0):
+    """7-card evaluations/sec: treys, LookupEvaluator.evaluate and evaluate_batch."""
+    from hand_eval import LookupEvaluator
+
+    rng = random.Random(seed)
+    deck = Deck.GetFullDeck()
+    hands = [rng.sample(deck, 7) for _ in range(num_hands)]
+    results = {}
+    for name, evaluator in (("treys", Evaluator()), ("lookup", LookupEvaluator())):
+        start = time.perf_counter()
+        for h in hands:
+            evaluator.evaluate(h[:2], h[2:])
+        results[f"showdown_{name}_per_sec"] = num_hands / (time.perf_counter() - start)
+        if name == "lookup":
+            cards = np.array(hands)
+            start = time.perf_counter()
+            evaluator.evaluate_batch(cards)
+            results["showdown_batch_per_sec"] = num_hands / (time.perf_counter() - start)
+    return results
+
+
+def bench_llm_decision(api_url, num_decisions=100):
+    """LLMAgent.get_action latency (seconds) against the stub server."""
+    agent = LLMAgent("Bench_LLM", api_url=api_url, client=LLMClient(api_url))
+    env = PokerEnv(rng=0)
+    obs = env.reset_hand()
+    latencies = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(num_decisions):
+            start = time.perf_counter()
+            agent.get_action(obs)
+            latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    return {
+        "llm_decision_p50": latencies[len(latencies) // 2],
+        "llm_decision_p95": latencies[int(len(latencies) * 0.95)],
+    }
+
+
+def bench_memory(num_tables=200):
+    """Bytes allocated per PokerEnv table (after one dealt hand)."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    tables = [PokerEnv(rng=i) for i in range(num_tables)]
+    for table in tables:
+        table.reset_hand()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return {"memory_per_table_bytes": used / num_tables}
+
+
+def _bench_cpu(scale):
+    results = {}
+    results.update(bench_env(num_hands=20000 // scale))
+    results.update(bench_match(num_matches=50 // scale))
+    results.update(bench_showdown(num_hands=50000 // scale))
+    for name, (numerator, denominator) in RATIOS.items():
+        results[name] = results[numerator] / results[denominator]
+    return results
+
+
+def run_all(llm_delay=0.02, quick=False, repeats=5):
+    """
+    Runs every benchmark. The CPU-bound ones get a warmup pass and then
+    report the median of repeats runs; each ratio is the median of its
+    per-run ratios, so a burst of load on the machine moves it little.
+    """
+    scale = 10 if quick else 1
+    _bench_cpu(scale) # Warmup: lookup tables, imports, allocator
+    runs = [_bench_cpu(scale) for _ in range(repeats)]
+    results = {name: statistics.median(run[name] for run in runs) for name in runs[0]}
+    with stub_llm_server(llm_delay) as api_url:
+        results.update(bench_llm_decision(api_url, num_decisions=100 // scale))
+    results.update(bench_memory())
+    return results
+
+
+def machine_info():
+    """What a baseline was measured on; absolute numbers only compare on the same machine."""
+    cpu = platform.processor()
+    try:
+        with open("/proc/cpuinfo") as f:
+            cpu = next((line.split(":", 1)[1].strip() for line in f if line.startswith("model name")), cpu)
+    except OSError:
+        pass
+    return {"cpu": cpu, "cpus": os.cpu_count(), "platform": platform.platform(), "python": platform.python_version()}
+
+
+def load_baseline(path):
+    """(metrics, machine, quick) from a baseline file; machine is None for old flat files."""
+    with open(path) as f:
+        data = json.load(f)
+    if "metrics" in data:
+        return data["metrics"], data.get("machine"), data.get("quick", False)
+    return data, None, False
+
+
+def compare(results, baseline, tolerance=0.3, same_machine=False):
+    """
+    Names of metrics more than tolerance (fractional) worse than baseline.
+    Unless the baseline comes from the same machine, only PORTABLE_METRICS
+    are compared.
+    """
+    regressions = []
+    for name, value in results.items():
+        if name not in baseline or not baseline[name]:
+            continue
+        if not same_machine and name not in PORTABLE_METRICS:
+            continue
+        change = (value - baseline[name]) / baseline[name]
+        if name not in HIGHER_IS_BETTER:
+            change = -change
+        if change < -tolerance:
+            regressions.append(name)
+    return regressions
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="Benchmark the poker simulation stack (offline, stub LLM server)")
+    parser.add_argument("--save", metavar="PATH", nargs="?", const=BASELINE_PATH, help="Write results as the new baseline")
+    parser.add_argument("--compare", metavar="PATH", nargs="?", const=BASELINE_PATH, help="Compare against a saved baseline, exit 1 on regression")
+    parser.add_argument("--tolerance", type=float, default=0.3, help="Allowed fractional slowdown before a regression")
+    parser.add_argument("--llm-delay", type=float, default=0.02, help="Stub server think time in seconds")
+    parser.add_argument("--quick", action="store_true", help="10x fewer iterations; only compared against a --quick baseline")
+    parser.add_argument("--repeats", type=int, default=5, help="Runs of the CPU benchmarks to take the median of")
+    args = parser.parse_args()
+
+    results = run_all(llm_delay=args.llm_delay, quick=args.quick, repeats=args.repeats)
+    baseline, baseline_machine, baseline_quick = load_baseline(args.compare) if args.compare else ({}, None, args.quick)
+    same_machine = baseline_machine == machine_info()
+    if baseline_quick != args.quick:
+        # Quick runs are too short to hold to a full baseline (and the reverse)
+        print(f"Baseline {args.compare} was measured {'with' if baseline_quick else 'without'} --quick; not comparing")
+        args.compare, baseline = None, {}
+
+    for name, value in results.items():
+        line = f"{name:28s} {value:>16,.4f}"
+        if name in baseline:
+            line += f"   baseline {baseline[name]:>16,.4f} ({(value - baseline[name]) / baseline[name]:+.1%})"
+        print(line)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({"machine": machine_info(), "quick": args.quick, "metrics": results}, f, indent=2)
+        print(f"Saved baseline to {args.save}")
+
+    if args.compare:
+        if not same_machine:
+            print(f"Baseline is from another machine ({baseline_machine}): comparing only {', '.join(sorted(PORTABLE_METRICS))}")
+        regressions = compare(results, baseline, args.tolerance, same_machine)
+        if regressions:
+            print(f"Regressions beyond {args.tolerance:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+        print("No regressions")
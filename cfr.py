@@ -0,0 +1,114 @@
+import numpy as np
+
+FOLD, CALL, RAISE = "f", "c", "r"
+
+
+class BucketedCFR:
+    """
+    Tabular CFR+ for a one-street, heads-up abstraction of hold'em.
+
+    Each player holds one of num_buckets strength buckets (equal-frequency
+    equity quantiles, higher is stronger); at showdown the higher bucket
+    wins and equal buckets split. Both players ante 1, raises are pot
+    sized and capped at max_raises. Information sets are
+    (bucket, betting history); the average strategy is what agents play.
+    """
+
+    def __init__(self, num_buckets=10, max_raises=2):
+        self.num_buckets = num_buckets
+        self.max_raises = max_raises
+        i = np.arange(num_buckets)
+        self.showdown = np.sign(i[:, None] - i[None, :]).astype(np.float64)
+        self.regrets = {}
+        self.strategy_sums = {}
+        self.iterations = 0
+
+    def actions(self, history):
+        raises = history.count(RAISE)
+        if history.endswith(RAISE):
+            return (FOLD, CALL, RAISE) if raises < self.max_raises else (FOLD, CALL)
+        return (CALL, RAISE)
+
+    def _terminal(self, history):
+        return history.endswith(FOLD) or history == CALL + CALL or history.endswith(RAISE + CALL)
+
+    def _contributions(self, history):
+        bets = [1.0, 1.0]
+        player = 0
+        for action in history:
+            other = 1 - player
+            if action == CALL:
+                bets[player] = bets[other]
+            elif action == RAISE:
+                to_call = bets[other] - bets[player]
+                bets[player] = bets[other] + (sum(bets) + to_call)
+            player = other
+        return bets
+
+    def train(self, iterations=1000):
+        ones = np.ones(self.num_buckets)
+        for _ in range(iterations):
+            self.iterations += 1
+            self._cfr("", ones, ones)
+        return self
+
+    def _cfr(self, history, reach0, reach1):
+        # Returns counterfactual utilities (B,) for player 0 and player 1
+        player = len(history) % 2
+        if self._terminal(history):
+            bets = self._contributions(history)
+            if history.endswith(FOLD):
+                folder = 1 - player
+                sign = -1.0 if folder == 0 else 1.0
+                return sign * bets[folder] * reach1.sum() * np.ones_like(reach0), -sign * bets[folder] * reach0.sum() * np.ones_like(reach1)
+            stake = bets[0]
+            return stake * self.showdown @ reach1, -stake * self.showdown.T @ reach0
+
+        actions = self.actions(history)
+        strategy = self._strategy(history, len(actions))
+        reach = (reach0, reach1)
+        action_utils = np.empty((self.num_buckets, len(actions)))
+        opponent_util = np.zeros(self.num_buckets)
+        for a, action in enumerate(actions):
+            child_reach = list(reach)
+            child_reach[player] = reach[player] * strategy[:, a]
+            utils = self._cfr(history + action, *child_reach)
+            action_utils[:, a] = utils[player]
+            opponent_util += utils[1 - player]
+
+        node_util = (strategy * action_utils).sum(axis=1)
+        regrets = self.regrets[history]
+        np.maximum(regrets + action_utils - node_util[:, None], 0.0, out=regrets)
+        # Linear averaging: later, better iterates count for more
+        self.strategy_sums[history] += self.iterations * reach[player][:, None] * strategy
+        return (node_util, opponent_util) if player == 0 else (opponent_util, node_util)
+
+    def _strategy(self, history, num_actions):
+        if history not in self.regrets:
+            self.regrets[history] = np.zeros((self.num_buckets, num_actions))
+            self.strategy_sums[history] = np.zeros((self.num_buckets, num_actions))
+        positive = self.regrets[history]
+        totals = positive.sum(axis=1, keepdims=True)
+        return np.where(totals > 0, positive / np.where(totals > 0, totals, 1.0), 1.0 / num_actions)
+
+    def average_strategy(self, history):
+        """(num_buckets, len(actions(history))) action probabilities."""
+        sums = self.strategy_sums[history]
+        totals = sums.sum(axis=1, keepdims=True)
+        return np.where(totals > 0, sums / np.where(totals > 0, totals, 1.0), 1.0 / sums.shape[1])
+
+    def policy(self):
+        """{history: average strategy as nested lists} for every decision node."""
+        return {history: self.average_strategy(history).tolist() for history in self.strategy_sums}
+
+
+if __name__ == "__main__":
+    import time
+
+    start = time.perf_counter()
+    solver = BucketedCFR().train(2000)
+    print(f"Trained {solver.iterations} iterations in {time.perf_counter() - start:.2f}s")
+    for history in sorted(solver.strategy_sums, key=len):
+        print(f"history '{history}' actions {solver.actions(history)}")
+        for bucket, probs in enumerate(solver.average_strategy(history)):
+            print(f"  bucket {bucket}: {' '.join(f'{p:.2f}' for p in probs)}")
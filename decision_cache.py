@@ -0,0 +1,112 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from treys import Card
+
+from poker_env import Observation
+
+_RANK_ORDER = "23456789TJQKA"
+
+
+def canonical_cards(hand, board):
+    """
+    Suit-isomorphic form of hand and board ('As', 'Kd' style strings).
+    Cards are sorted by rank and suits are renamed in order of first
+    appearance, so e.g. AhKh and AsKs map to the same key.
+    """
+    def order(cards):
+        return sorted(cards, key=lambda c: (-_RANK_ORDER.index(c[0]), c[1]))
+
+    hand, board = order(hand), order(board)
+    suit_names = {}
+    for _, suit in hand + board:
+        if suit not in suit_names:
+            suit_names[suit] = "abcd"[len(suit_names)]
+    relabel = lambda cards: "".join(rank + suit_names[suit] for rank, suit in cards)
+    return relabel(hand), relabel(board)
+
+
+class DecisionCache:
+    """
+    LRU cache of agent decisions keyed on (system prompt hash, canonical state).
+
+    The canonical state keeps the stage, pot and stack rounded down to
+    bucket_size chips, the exact amount to call, and suit-isomorphic cards.
+    Entries persist to a JSON file between runs.
+    """
+
+    def __init__(self, path=None, max_size=100000, bucket_size=20):
+        self.path = path
+        self.max_size = max_size
+        self.bucket_size = bucket_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            self.load(path)
+
+    def key(self, system_prompt, game_state):
+        """
+        Cache key for a poker_env.Observation or its text rendering,
+        or None if the text cannot be parsed.
+        """
+        if isinstance(game_state, str):
+            game_state = Observation.from_text(game_state)
+            if game_state is None:
+                return None
+        hand = [Card.int_to_str(c) for c in game_state.hand]
+        board = [Card.int_to_str(c) for c in game_state.community]
+        hand, board = canonical_cards(hand, board)
+        prompt_hash = hashlib.sha1(system_prompt.encode()).hexdigest()[:16]
+        return "|".join([
+            prompt_hash, game_state.stage,
+            str(game_state.pot // self.bucket_size), str(game_state.stack // self.bucket_size), str(game_state.to_call),
+            hand, board,
+        ])
+
+    def get(self, key):
+        with self._lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, decision):
+        with self._lock:
+            self.entries[key] = tuple(decision)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self.entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def load(self, path):
+        with open(path) as f:
+            entries = json.load(f)
+        with self._lock:
+            for key, decision in entries.items():
+                self.entries[key] = tuple(decision)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def save(self, path=None):
+        path = path or self.path
+        with self._lock:
+            entries = dict(self.entries)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(entries, f)
+        os.replace(tmp_path, path)
@@ -0,0 +1,107 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from hand_eval import LookupEvaluator, card_index, DECK
+
+
+@dataclass(slots=True, frozen=True)
+class EquityResult:
+    win: float # P(hero beats every opponent)
+    tie: float # P(hero shares the best hand)
+    equity: float # Expected pot share: win + tie split between the tied hands
+    stderr: float # Standard error of equity
+    rollouts: int
+
+
+class EquityCalculator:
+    """
+    Monte Carlo hand equity against random opponent hands.
+
+    Rollouts are drawn and evaluated in NumPy batches (see
+    hand_eval.LookupEvaluator.evaluate_batch); sampling stops once the
+    confidence interval half-width on equity drops below tolerance.
+    """
+
+    def __init__(self, evaluator=None, seed=None, batch_size=4096, max_rollouts=200000, tolerance=0.005, z=1.96):
+        self.evaluator = evaluator or LookupEvaluator()
+        self.rng = np.random.default_rng(seed)
+        self.batch_size = batch_size
+        self.max_rollouts = max_rollouts
+        self.tolerance = tolerance
+        self.z = z
+
+    def estimate(self, hand, board=(), num_opponents=1, seed=None):
+        """
+        hand: two treys card ints, board: 0-5 treys card ints
+        seed, if given, draws this estimate from its own generator instead
+        of the calculator's shared one. Returns an EquityResult.
+        """
+        rng = self.rng if seed is None else np.random.default_rng(seed)
+        known = set(card_index(list(hand) + list(board)).tolist())
+        remaining = DECK[[i for i in range(52) if i not in known]]
+        board_needed = 5 - len(board)
+        needed = 2 * num_opponents + board_needed
+
+        hero = np.array(list(hand) + list(board), dtype=np.int64)
+        wins = ties = 0
+        equity_sum = equity_sq_sum = 0.0
+        n = 0
+        while n < self.max_rollouts:
+            size = min(self.batch_size, self.max_rollouts - n)
+            # Sample without replacement per rollout: first `needed` of a random permutation
+            draws = remaining[np.argpartition(rng.random((size, len(remaining))), needed - 1, axis=1)[:, :needed]]
+            runout = draws[:, :board_needed]
+            full_board = np.hstack([np.broadcast_to(hero[2:], (size, len(board))), runout])
+
+            hero_rank = self.evaluator.evaluate_batch(np.hstack([np.broadcast_to(hero[:2], (size, 2)), full_board]))
+            opp_ranks = np.stack([
+                self.evaluator.evaluate_batch(np.hstack([draws[:, board_needed + 2 * k:board_needed + 2 * k + 2], full_board]))
+                for k in range(num_opponents)
+            ], axis=1)
+
+            best_opp = opp_ranks.min(axis=1)
+            won = hero_rank < best_opp
+            tied = hero_rank == best_opp
+            share = np.where(won, 1.0, np.where(tied, 1.0 / (1 + (opp_ranks == hero_rank[:, None]).sum(axis=1)), 0.0))
+
+            wins += int(won.sum())
+            ties += int(tied.sum())
+            equity_sum += share.sum()
+            equity_sq_sum += (share ** 2).sum()
+            n += size
+
+            stderr = self._stderr(equity_sum, equity_sq_sum, n)
+            if self.z * stderr < self.tolerance:
+                break
+
+        return EquityResult(win=wins / n, tie=ties / n, equity=float(equity_sum / n), stderr=float(stderr), rollouts=n)
+
+    def estimate_obs(self, obs, num_opponents=None, seed=None):
+        """Equity for a poker_env.Observation against the players still in the hand."""
+        return self.estimate(obs.hand, obs.community, num_opponents or obs.num_opponents, seed)
+
+    @staticmethod
+    def _stderr(total, sq_total, n):
+        mean = total / n
+        variance = max(sq_total / n - mean * mean, 0.0)
+        return (variance / n) ** 0.5
+
+
+if __name__ == "__main__":
+    import time
+    from treys import Card
+
+    calc = EquityCalculator(seed=0)
+    spots = [
+        (["Ah", "As"], [], 1),
+        (["7c", "2d"], [], 2),
+        (["Kh", "Qh"], ["Jh", "Th", "2c"], 1),
+        (["9s", "9d"], ["Ac", "Kd", "4h", "4s"], 2),
+    ]
+    for hand, board, opponents in spots:
+        start = time.perf_counter()
+        result = calc.estimate([Card.new(c) for c in hand], [Card.new(c) for c in board], opponents)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"{' '.join(hand):6s} | {' '.join(board):12s} vs {opponents}: equity {result.equity:.3f} +/- {calc.z * result.stderr:.3f} "
+              f"({result.rollouts} rollouts, {elapsed:.1f} ms)")
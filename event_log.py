@@ -0,0 +1,149 @@
+import atexit
+import gzip
+import json
+import os
+import queue
+import threading
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+_STOP = object()
+_FLUSH = object()
+
+
+def _open_compressed(path, mode):
+    # mode is 'rb', 'wb' or 'ab'
+    if path.endswith(".gz"):
+        return gzip.open(path, mode)
+    if path.endswith(".zst"):
+        if zstandard is None:
+            raise ImportError("zstandard is required for .zst logs (pip install zstandard)")
+        raw = open(path, mode)
+        if mode == 'rb':
+            # Appended (resumed) logs hold one zstd frame per writer session
+            return zstandard.ZstdDecompressor().stream_reader(raw, closefd=True, read_across_frames=True)
+        return zstandard.ZstdCompressor().stream_writer(raw, closefd=True)
+    return open(path, mode)
+
+
+def read_events(path):
+    """Yields the entries of a plain, .gz or .zst JSONL log."""
+    with _open_compressed(path, 'rb') as f:
+        buffer = b""
+        while True:
+            chunk = f.read(1 << 20)
+            if not chunk:
+                break
+            lines = (buffer + chunk).split(b"\n")
+            buffer = lines.pop()
+            for line in lines:
+                if line.strip():
+                    yield json.loads(line)
+        if buffer.strip():
+            yield json.loads(buffer)
+
+
+class EventLogWriter:
+    """
+    Appends JSONL events from a background thread.
+
+    write() only enqueues; the writer thread encodes and writes events in
+    batches, flushing every flush_interval seconds. compression may be
+    None, "gzip" or "zstd" (adds .gz/.zst to the path). With max_bytes
+    set, the file rotates to path.1 ... path.<backup_count> once a flush
+    leaves it larger than that.
+    """
+
+    def __init__(self, path, mode='w', compression=None, flush_interval=1.0, max_bytes=None, backup_count=5, batch_size=1000):
+        suffix = {None: "", "gzip": ".gz", "zstd": ".zst"}[compression]
+        self.path = path if path.endswith(suffix) else path + suffix
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.batch_size = batch_size
+
+        self._file = _open_compressed(self.path, mode + 'b')
+        self._queue = queue.Queue()
+        self._flushed = threading.Condition()
+        self._pending_flushes = 0
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="event-log", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def write(self, entry):
+        self._queue.put(entry)
+
+    def flush(self):
+        """Blocks until every event written so far is on disk."""
+        with self._flushed:
+            self._pending_flushes += 1
+            self._queue.put(_FLUSH)
+            self._flushed.wait_for(lambda: self._pending_flushes == 0 or self._closed)
+
+    def close(self):
+        if self._closed:
+            return
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def _run(self):
+        try:
+            self._loop()
+        finally:
+            # Even if the writer dies, flush() and close() must not wait forever
+            with self._flushed:
+                self._closed = True
+                self._flushed.notify_all()
+
+    def _loop(self):
+        batch = []
+        while True:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                item = None
+
+            if item is None or item is _FLUSH or item is _STOP:
+                self._write_batch(batch)
+                batch = []
+                self._file.flush()
+                self._maybe_rotate()
+                if item is _STOP:
+                    self._file.close()
+                    return
+                if item is _FLUSH:
+                    with self._flushed:
+                        self._pending_flushes -= 1
+                        self._flushed.notify_all()
+                continue
+
+            batch.append(item)
+            if len(batch) >= self.batch_size:
+                self._write_batch(batch)
+                batch = []
+                self._maybe_rotate()
+
+    def _write_batch(self, batch):
+        lines = []
+        for entry in batch:
+            try:
+                lines.append(json.dumps(entry) + "\n")
+            except (TypeError, ValueError) as e:
+                # One bad event is dropped, not the writer thread
+                print(f"EventLogWriter: dropping unserializable event: {e}")
+        if lines:
+            self._file.write("".join(lines).encode())
+
+    def _maybe_rotate(self):
+        if not self.max_bytes or os.path.getsize(self.path) < self.max_bytes:
+            return
+        self._file.close()
+        for i in range(self.backup_count - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{i}"):
+                os.replace(f"{self.path}.{i}", f"{self.path}.{i + 1}")
+        os.replace(self.path, f"{self.path}.1")
+        self._file = _open_compressed(self.path, 'wb')
@@ -1,14 +1,31 @@
-import requests
+import json
+import re
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from llm_client import LLMClient
 
 class PromptMutator:
-    def __init__(self, api_url="http://localhost:1234/v1/chat/completions", model_name="local-model"):
+    """
+    Rewrites agent system prompts with an LLM.
+
+    mutate_batch asks for several children per request: batch_mode "n" sets
+    the OpenAI n parameter, "json" asks for a JSON list of prompts (for
+    servers that ignore n). Requests for different mutation types run
+    concurrently, children missing from a short response are requested
+    in parallel singles, and duplicate children are re-requested.
+    """
+    def __init__(self, api_url="http://localhost:1234/v1/chat/completions", model_name="local-model", client=None, batch_mode="n", max_workers=4):
+        if batch_mode not in ("n", "json"):
+            raise ValueError(f"Unknown batch_mode: {batch_mode}")
         self.api_url = api_url
         self.model_name = model_name
+        self.client = client or LLMClient.shared(api_url)
+        self.batch_mode = batch_mode
+        self.max_workers = max_workers
+        # Set once a response has fewer choices than n; later rounds then send single requests
+        self._ignores_n = False
 
-    def mutate_prompt(self, parent_prompt, mutation_type="random"):
-        """
-        Uses an LLM to rewrite the parent prompt, introducing variations.
-        """
+    def _payload(self, parent_prompt, mutation_type, count=1, as_list=False):
         instruction = ""
         if mutation_type == "aggressive":
             instruction = "Rewrite this poker strategy to be significantly more aggressive and bluff-heavy."
@@ -17,13 +34,18 @@ class PromptMutator:
         else:
             instruction = "Rewrite this poker strategy to minimize weaknesses and improve decision making. Keep it concise."
 
+        if as_list:
+            output_format = f"Write {count} different new System Prompts. Output ONLY a JSON list of {count} strings."
+        else:
+            output_format = "Output ONLY the new System Prompt. Do not add conversational filler."
+
         mutation_request_prompt = f"""
         You are an Expert Poker Coach.
         Here is a player's strategy (System Prompt):
         "{parent_prompt}"
         
         {instruction}
-        Output ONLY the new System Prompt. Do not add conversational filler.
+        {output_format}
         """
         
         messages = [
@@ -36,12 +58,84 @@ class PromptMutator:
             "messages": messages,
             "temperature": 1.0, # High temp for diversity
         }
-        
+        if count > 1 and not as_list:
+            payload["n"] = count
+        return payload
+
+    def mutate_prompt(self, parent_prompt, mutation_type="random"):
+        """
+        Uses an LLM to rewrite the parent prompt, introducing variations.
+        """
         try:
-            response = requests.post(self.api_url, json=payload, headers={"Content-Type": "application/json"}, timeout=30)
-            response.raise_for_status()
-            new_prompt = response.json()['choices'][0]['message']['content']
+            new_prompt = self.client.chat(self._payload(parent_prompt, mutation_type), timeout=30)['choices'][0]['message']['content']
             return new_prompt.strip()
         except Exception as e:
             print(f"Mutation Failed: {e}")
             return parent_prompt # Fallback: Clone parent
+
+    def _request_variants(self, parent_prompt, mutation_type, count):
+        # Up to count child prompts from one request; fewer if the server ignores n
+        try:
+            if self.batch_mode == "json" and count > 1:
+                result = self.client.chat(self._payload(parent_prompt, mutation_type, count, as_list=True), timeout=60)
+                content = result['choices'][0]['message']['content']
+                match = re.search(r"\[.*\]", content, re.DOTALL)
+                variants = json.loads(match.group(0)) if match else [content]
+            else:
+                result = self.client.chat(self._payload(parent_prompt, mutation_type, count), timeout=30)
+                variants = [choice['message']['content'] for choice in result['choices']]
+            return [v.strip() for v in variants if isinstance(v, str) and v.strip()]
+        except Exception as e:
+            print(f"Mutation Failed: {e}")
+            return []
+
+    def mutate_batch(self, parent_prompt, num_children, mutation_types=None, attempts=3):
+        """
+        Returns num_children child prompts, distinct from each other and
+        from the parent. mutation_types gives one type per child (default
+        all "random"). Slots still unfilled after attempts rounds fall back
+        to cloning the parent, as in mutate_prompt.
+        """
+        types = list(mutation_types or ["random"] * num_children)
+        children = [None] * num_children
+        seen = {_normalize(parent_prompt)}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            for _ in range(attempts):
+                wanted = Counter(t for t, child in zip(types, children) if child is None)
+                if not wanted:
+                    break
+                for mutation_type, variants in self._request_round(pool, parent_prompt, wanted):
+                    for variant in variants:
+                        key = _normalize(variant)
+                        if key in seen:
+                            continue
+                        slot = next((i for i, (t, child) in enumerate(zip(types, children)) if child is None and t == mutation_type), None)
+                        if slot is None:
+                            break
+                        seen.add(key)
+                        children[slot] = variant
+        return [child if child is not None else parent_prompt for child in children]
+
+    def _request_round(self, pool, parent_prompt, wanted):
+        # (mutation type, variants) for one round of {mutation type: count} requests, all in flight at once
+        if self.batch_mode == "n" and self._ignores_n:
+            futures = [(t, pool.submit(self._request_variants, parent_prompt, t, 1)) for t, count in wanted.items() for _ in range(count)]
+            return [(t, future.result()) for t, future in futures]
+
+        futures = [(t, pool.submit(self._request_variants, parent_prompt, t, count)) for t, count in wanted.items()]
+        results, top_ups = [], []
+        for mutation_type, future in futures:
+            variants = future.result()
+            results.append((mutation_type, variants))
+            missing = wanted[mutation_type] - len(variants)
+            if missing > 0 and variants:
+                # Fewer choices than asked for (the server ignores n, or the list came back short):
+                # the rest go out as parallel single requests in this same round
+                if self.batch_mode == "n":
+                    self._ignores_n = True
+                top_ups += [(mutation_type, pool.submit(self._request_variants, parent_prompt, mutation_type, 1)) for _ in range(missing)]
+        results += [(mutation_type, future.result()) for mutation_type, future in top_ups]
+        return results
+
+def _normalize(prompt):
+    return " ".join(prompt.split()).lower()
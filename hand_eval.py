@@ -0,0 +1,167 @@
+import os
+import math
+import numpy as np
+from treys import Deck, Evaluator
+from treys.lookup import LookupTable
+
+TABLE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Card index 0..51 (rank * 4 + suit) <-> treys card int
+DECK = np.array(sorted(Deck.GetFullDeck(), key=lambda c: ((c >> 8) & 0xF, (c >> 12) & 0xF)), dtype=np.int64)
+_SUIT_INDEX = np.array([0, 0, 1, 0, 2, 0, 0, 0, 3], dtype=np.int64)
+
+# BINOM[n, k] = n choose k. A sorted hand c0 < c1 < ... has the perfect hash
+# sum(BINOM[c_i, i + 1]) (combinatorial number system), dense in [0, C(52, k)).
+BINOM = np.array([[math.comb(n, k) for k in range(8)] for n in range(53)], dtype=np.int64)
+
+WORST_RANK = LookupTable.MAX_HIGH_CARD + 1 # Sorts after every real hand
+_CHUNK = 1 << 20
+
+
+def card_index(cards):
+    """Maps treys card ints to 0..51."""
+    cards = np.asarray(cards, dtype=np.int64)
+    return ((cards >> 8) & 0xF) * 4 + _SUIT_INDEX[(cards >> 12) & 0xF]
+
+
+def hand_key(idx):
+    """Perfect hash of (M, k) card indices sorted ascending."""
+    key = BINOM[idx[:, 0], 1]
+    for i in range(1, idx.shape[1]):
+        key = key + BINOM[idx[:, i], i + 1]
+    return key
+
+
+def _colex_combos(r):
+    # All r-subsets of range(52), row i being the subset with hand_key i
+    combos = np.arange(52, dtype=np.int8)[:, None]
+    for size in range(2, r + 1):
+        combos = np.concatenate([
+            np.column_stack([combos[:math.comb(top, size - 1)], np.full(math.comb(top, size - 1), top, dtype=np.int8)])
+            for top in range(size - 1, 52)
+        ])
+    return combos
+
+
+def _build_five():
+    # Uses treys' own lookup dicts, so ranks are identical to treys.Evaluator
+    cards = DECK[_colex_combos(5)]
+    flush = np.bitwise_and.reduce(cards, axis=1) & 0xF000 != 0
+    # All five ranks differ in a flush, so the card prime product equals
+    # treys' prime_product_from_rankbits
+    prime = np.prod(cards & 0xFF, axis=1)
+
+    table = np.empty(len(cards), dtype=np.uint16)
+    lookup = LookupTable()
+    for mask, ranks_by_prime in ((flush, lookup.flush_lookup), (~flush, lookup.unsuited_lookup)):
+        keys = np.array(sorted(ranks_by_prime), dtype=np.int64)
+        values = np.array([ranks_by_prime[k] for k in keys], dtype=np.uint16)
+        table[mask] = values[np.searchsorted(keys, prime[mask])]
+    return table
+
+
+def _extend(prev, k, out):
+    """
+    Fills out with k-card ranks from the (k-1)-card table prev.
+    Hands whose top card is m are a (k-1)-card prefix P plus m, so their
+    rank is min(prev[P], prev[P - p_i + m] for each p_i in P).
+    """
+    prefixes = _colex_combos(k - 1)
+    zeros = np.zeros((_CHUNK, 1), dtype=np.int64)
+    for m in range(k - 1, 52):
+        base = math.comb(m, k)
+        stop = math.comb(m, k - 1)
+        for start in range(0, stop, _CHUNK):
+            p = prefixes[start:min(start + _CHUNK, stop)].astype(np.int64)
+            n = len(p)
+            best = np.array(prev[start:start + n])
+            # Key of P without p_i: cards below i keep their slot, cards above shift down one
+            lower = np.cumsum(np.hstack([zeros[:n], BINOM[p[:, :-1], np.arange(1, k - 1)]]), axis=1)
+            upper = np.cumsum(np.hstack([zeros[:n], BINOM[p[:, :0:-1], np.arange(k - 2, 0, -1)]]), axis=1)[:, ::-1]
+            for i in range(k - 1):
+                np.minimum(best, prev[lower[:, i] + upper[:, i] + BINOM[m, k - 1]], out=best)
+            out[base + start:base + start + n] = best
+
+
+def load_tables(table_dir=TABLE_DIR):
+    """
+    Memory-maps the 5, 6 and 7 card rank tables, building and caching
+    them on first use (about 300 MB on disk, mostly the 7-card table).
+    """
+    tables = {}
+    for k in (5, 6, 7):
+        path = os.path.join(table_dir, f"hand_ranks_{k}.npy")
+        if not os.path.exists(path):
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            out = np.lib.format.open_memmap(tmp_path, mode='w+', dtype=np.uint16, shape=(math.comb(52, k),))
+            if k == 5:
+                out[:] = _build_five()
+            else:
+                _extend(tables[k - 1], k, out)
+            out.flush()
+            del out
+            os.replace(tmp_path, path)
+        tables[k] = np.load(path, mmap_mode='r')
+    return tables
+
+
+class LookupEvaluator(Evaluator):
+    """
+    Drop-in replacement for treys.Evaluator backed by precomputed rank
+    tables: any 5-7 card hand is one hash and one table read.
+    evaluate_batch ranks whole arrays of hands with NumPy.
+    Lower rank is better, as in treys.
+    """
+
+    def __init__(self, table_dir=TABLE_DIR):
+        super().__init__()
+        self.tables = load_tables(table_dir)
+        self._index_of = {int(c): i for i, c in enumerate(DECK)}
+        self._binom = [BINOM[:, k].tolist() for k in range(8)]
+
+    def evaluate(self, hand, board):
+        index_of, binom = self._index_of, self._binom
+        idx = sorted([index_of[c] for c in hand] + [index_of[c] for c in board])
+        key = 0
+        for i, c in enumerate(idx):
+            key += binom[i + 1][c]
+        return int(self.tables[len(idx)][key])
+
+    def evaluate_batch(self, cards):
+        """
+        cards: (M, k) array of treys card ints, 5 <= k <= 7
+        Returns an (M,) array of hand ranks.
+        """
+        idx = np.sort(card_index(cards), axis=1)
+        return self.tables[idx.shape[1]][hand_key(idx)]
+
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    start = time.perf_counter()
+    evaluator = LookupEvaluator()
+    print(f"Loaded rank tables in {time.perf_counter() - start:.1f}s")
+    treys_evaluator = Evaluator()
+    full_deck = Deck.GetFullDeck()
+
+    for num_cards in (5, 6, 7):
+        hands = [random.sample(full_deck, num_cards) for _ in range(50000)]
+        start = time.perf_counter()
+        expected = [treys_evaluator.evaluate(h[:2], h[2:]) for h in hands]
+        treys_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        single = [evaluator.evaluate(h[:2], h[2:]) for h in hands]
+        single_time = time.perf_counter() - start
+
+        cards = np.array(hands)
+        start = time.perf_counter()
+        batch = evaluator.evaluate_batch(cards)
+        batch_time = time.perf_counter() - start
+
+        assert single == expected and batch.tolist() == expected
+        print(f"{num_cards}-card hands")
+        for name, elapsed in (("treys", treys_time), ("LookupEvaluator.evaluate", single_time), ("LookupEvaluator.evaluate_batch", batch_time)):
+            print(f"  {name:32s} {len(hands) / elapsed:>14,.0f} hands/sec")
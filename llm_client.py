@@ -0,0 +1,123 @@
+import json
+import threading
+import time
+from collections import deque
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from profiler import PROFILER
+
+DEFAULT_API_URL = "http://localhost:1234/v1/chat/completions"
+
+
+class LLMClient:
+    """
+    Pooled keep-alive client for an OpenAI-compatible chat endpoint (LM Studio).
+
+    One requests.Session per endpoint reuses TCP connections across
+    decisions, retries transient failures with backoff and records
+    per-request latency.
+    """
+
+    _shared = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, api_url=DEFAULT_API_URL, pool_size=16, retries=3, backoff=0.2, history=10000):
+        self.api_url = api_url
+        self.session = requests.Session()
+        self.session.headers["Content-Type"] = "application/json"
+
+        # Chat completions have no side effects, so POST is safe to retry on
+        # connect errors and error statuses. Read timeouts are not retried: the
+        # server is still generating, and a retry would only restart it.
+        retry = Retry(total=retries, read=0, backoff_factor=backoff, status_forcelist=(429, 500, 502, 503, 504), allowed_methods=None, raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, pool_block=True, max_retries=retry)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._lock = threading.Lock()
+        self.latencies = deque(maxlen=history)
+        self.num_requests = 0
+        self.num_errors = 0
+
+    @classmethod
+    def shared(cls, api_url=DEFAULT_API_URL, **kwargs):
+        """Process-wide client for api_url, created on first use."""
+        with cls._shared_lock:
+            if api_url not in cls._shared:
+                cls._shared[api_url] = cls(api_url, **kwargs)
+            return cls._shared[api_url]
+
+    def chat(self, payload, timeout=10):
+        """POSTs a chat completion payload and returns the decoded JSON response."""
+        start = time.perf_counter()
+        ok = False
+        try:
+            response = self.session.post(self.api_url, json=payload, timeout=timeout)
+            response.raise_for_status()
+            result = response.json()
+            ok = True
+            return result
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.num_requests += 1
+                self.num_errors += not ok
+                self.latencies.append(elapsed)
+            PROFILER.observe("llm", elapsed)
+            PROFILER.count("llm_calls")
+
+    def stream_chat(self, payload, timeout=10):
+        """
+        POSTs payload with stream=True and yields the content deltas of the
+        server-sent events. Closing the generator early closes the
+        connection, which cancels the rest of the generation.
+        """
+        start = time.perf_counter()
+        ok = False
+        response = None
+        try:
+            response = self.session.post(self.api_url, json={**payload, "stream": True}, timeout=timeout, stream=True)
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if not line.startswith(b"data:"):
+                    continue
+                data = line[5:].strip()
+                if data == b"[DONE]":
+                    break
+                delta = json.loads(data)['choices'][0].get('delta', {}).get('content')
+                if delta:
+                    yield delta
+            ok = True
+        except GeneratorExit:
+            ok = True # Cancelled by the caller
+            raise
+        finally:
+            if response is not None:
+                response.close()
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.num_requests += 1
+                self.num_errors += not ok
+                self.latencies.append(elapsed)
+            PROFILER.observe("llm", elapsed)
+            PROFILER.count("llm_calls")
+
+    def stats(self):
+        """Request counts and latency percentiles (seconds) over recent requests."""
+        with self._lock:
+            latencies = sorted(self.latencies)
+            stats = {"requests": self.num_requests, "errors": self.num_errors}
+        if latencies:
+            stats.update({
+                "mean": sum(latencies) / len(latencies),
+                "p50": latencies[len(latencies) // 2],
+                "p95": latencies[int(len(latencies) * 0.95)],
+                "max": latencies[-1],
+            })
+        return stats
+
+    def close(self):
+        self.session.close()
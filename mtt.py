@@ -0,0 +1,131 @@
+import math
+import random
+
+from poker_env import PokerEnv
+from population import TableRunner, match_seed
+from scheduler import MatchScheduler
+from tournament import play_hands
+
+# (small blind, ante) per level
+BLIND_SCHEDULE = [
+    (10, 0), (15, 0), (25, 0), (50, 5), (75, 10), (100, 15), (150, 20),
+    (200, 25), (300, 40), (400, 50), (600, 75), (800, 100), (1000, 150),
+]
+
+
+def play_table(agents, stacks, small_blind, ante, num_hands, game_id, log_event, seed=None):
+    """Plays one blind level at a table and returns the seats' final stacks."""
+    env = PokerEnv(num_players=len(agents), small_blind=small_blind, ante=ante, rng=seed, stacks=stacks)
+    play_hands(env, agents, game_id, log_event, max_hands=num_hands)
+    # Stopping after num_hands leaves the next hand's blinds in the pot
+    if sum(p['stack'] for p in env.players) < sum(stacks):
+        env.cancel_hand()
+    return [p['stack'] for p in env.players]
+
+
+class MultiTableTournament:
+    """
+    Freezeout multi-table tournament.
+
+    Every table plays hands_per_level hands per blind level from schedule,
+    all tables at once on a population.TableRunner. Between levels busted
+    players are eliminated, tables are broken once the field fits on fewer
+    of them and the rest are balanced to within one seat. The button
+    rotates by moving the first seat to the back after each level.
+    run() returns agent names by finishing position, winner first.
+    """
+
+    def __init__(self, agents, table_size=3, starting_stack=500, schedule=BLIND_SCHEDULE, hands_per_level=10, workers=None, max_tables=4, seed=0, log_event=None, tournament_id="MTT"):
+        if len({a.name for a in agents}) != len(agents):
+            raise ValueError("Agent names must be unique")
+        self.agents = {a.name: a for a in agents}
+        self.table_size = table_size
+        self.schedule = schedule
+        self.hands_per_level = hands_per_level
+        self.workers = workers
+        self.scheduler = MatchScheduler(max_tables=max_tables)
+        self.seed = seed
+        self.log_event = log_event or (lambda event_type, data: None)
+        self.tournament_id = tournament_id
+
+        self.rng = random.Random(match_seed(seed, f"{tournament_id}_seating"))
+        self.stacks = {name: starting_stack for name in self.agents}
+        self.tables = self._seat(list(self.agents))
+        self.level = 0
+        self.busted = []
+        self.runner = TableRunner(workers)
+
+    def _seat(self, names):
+        names = names[:]
+        self.rng.shuffle(names)
+        num_tables = math.ceil(len(names) / self.table_size)
+        return [names[i::num_tables] for i in range(num_tables)]
+
+    def run(self):
+        while len(self.stacks) > 1:
+            self.play_level()
+        winner = next(iter(self.stacks))
+        standings = [winner] + self.busted[::-1]
+        self.log_event("mtt_end", {"tournament_id": self.tournament_id, "standings": standings, "levels": self.level})
+        self.close()
+        return standings
+
+    def play_level(self):
+        small_blind, ante = self.schedule[min(self.level, len(self.schedule) - 1)]
+        self.log_event("mtt_level", {"tournament_id": self.tournament_id, "level": self.level, "small_blind": small_blind, "ante": ante, "tables": self.tables})
+
+        results = self._play_tables(small_blind, ante)
+        starting = dict(self.stacks)
+        for table, stacks in zip(self.tables, results):
+            for name, stack in zip(table, stacks):
+                self.stacks[name] = stack
+
+        # Players busting in the same level finish in order of their stack going in
+        busted = sorted((name for name, stack in self.stacks.items() if stack == 0), key=lambda name: starting[name])
+        for name in busted:
+            self.log_event("bust", {"tournament_id": self.tournament_id, "agent": name, "position": len(self.stacks), "level": self.level})
+            del self.stacks[name]
+            self.busted.append(name)
+
+        self.tables = [[name for name in table[1:] + table[:1] if name in self.stacks] for table in self.tables]
+        self._balance()
+        self.level += 1
+
+    def _play_tables(self, small_blind, ante):
+        tables = []
+        for i, table in enumerate(self.tables):
+            game_id = f"{self.tournament_id}_L{self.level}_T{i}"
+            args = ([self.stacks[n] for n in table], small_blind, ante, self.hands_per_level, game_id)
+            tables.append(([self.agents[n] for n in table], args, match_seed(self.seed, game_id)))
+        return self.runner.run(play_table, tables, self.scheduler, self.log_event)
+
+    def _balance(self):
+        self.tables = [table for table in self.tables if table]
+        # Break the shortest table while the field fits on fewer
+        while len(self.tables) > math.ceil(len(self.stacks) / self.table_size):
+            self.tables.sort(key=len)
+            for name in self.tables.pop(0):
+                min(self.tables, key=len).append(name)
+        # Move players from the longest to the shortest table until within one seat
+        while self.tables and max(map(len, self.tables)) - min(map(len, self.tables)) > 1:
+            longest, shortest = max(self.tables, key=len), min(self.tables, key=len)
+            shortest.append(longest.pop(self.rng.randrange(len(longest))))
+
+    def close(self):
+        self.runner.close()
+
+
+if __name__ == "__main__":
+    import contextlib
+    import io
+    import time
+    from agents import CFRAgent, EquityAgent, PushFoldAgent, RandomAgent
+
+    players = [cls(f"{cls.__name__}_{i}") for i in range(4) for cls in (RandomAgent, EquityAgent, PushFoldAgent, CFRAgent)]
+    mtt = MultiTableTournament(players, table_size=3, hands_per_level=10)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        standings = mtt.run()
+    print(f"{len(players)} players, {mtt.level} levels in {time.perf_counter() - start:.1f}s")
+    for position, name in enumerate(standings, 1):
+        print(f"{position:3d}. {name}")
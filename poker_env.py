@@ -1,22 +1,125 @@
 import random
+import re
+import secrets
+from dataclasses import dataclass, asdict
+import numpy as np
 from treys import Deck, Evaluator, Card
 
+from profiler import PROFILER
+
+FULL_DECK = np.array(Deck.GetFullDeck(), dtype=np.int64)
+
+def make_rng(rng=None):
+    """
+    Shuffle source for PokerEnv.
+    None: cryptographic SystemRandom, for "legit" play.
+    int: NumPy PCG64 seeded with it, fast and reproducible for simulation.
+    Anything else is used as is (a numpy Generator or random.Random-like object).
+    """
+    if rng is None:
+        return secrets.SystemRandom()
+    if isinstance(rng, (int, np.integer)):
+        return np.random.Generator(np.random.PCG64(rng))
+    return rng
+
+class _Deck:
+    # Pre-shuffled cards; draw pops from the end like treys.Deck
+    __slots__ = ('cards',)
+
+    def __init__(self, cards):
+        self.cards = cards
+
+    def draw(self, n=1):
+        return [self.cards.pop() for _ in range(n)]
+
+@dataclass(slots=True, frozen=True)
+class Observation:
+    """
+    What the player to act can see. Cards are treys ints; the text view
+    for LLM prompts is only rendered when str() is called.
+    """
+    player: int
+    stage: str
+    pot: int
+    stack: int
+    to_call: int
+    community: tuple
+    hand: tuple
+    num_opponents: int = 1 # Players still in the hand besides this one
+    big_blind: int = 0 # Current big blind; 0 if unknown (parsed from text)
+
+    def __str__(self):
+        comm_str = [Card.int_to_str(c) for c in self.community]
+        hand_str = [Card.int_to_str(c) for c in self.hand]
+        
+        return f"""
+        Stage: {self.stage}
+        Pot: {self.pot}
+        Your Stack: {self.stack}
+        To Call: {self.to_call}
+        Community Cards: {comm_str}
+        Your Hand: {hand_str}
+        """
+
+    def to_dict(self):
+        return asdict(self)
+
+    @classmethod
+    def from_text(cls, text):
+        """Parses the str() rendering back (player is unknown), or None."""
+        match = _STATE_TEXT_RE.search(text)
+        if not match:
+            return None
+        stage, pot, stack, to_call, board, hand = match.groups()
+        return cls(
+            player=None,
+            stage=stage,
+            pot=int(pot),
+            stack=int(stack),
+            to_call=int(to_call),
+            community=tuple(Card.new(c) for c in _CARD_TEXT_RE.findall(board)),
+            hand=tuple(Card.new(c) for c in _CARD_TEXT_RE.findall(hand)),
+        )
+
+_STATE_TEXT_RE = re.compile(
+    r"Stage:\s*(\w+).*?Pot:\s*(-?\d+).*?Your Stack:\s*(-?\d+).*?To Call:\s*(-?\d+)"
+    r".*?Community Cards:\s*\[(.*?)\].*?Your Hand:\s*\[(.*?)\]",
+    re.DOTALL,
+)
+_CARD_TEXT_RE = re.compile(r"[2-9TJQKA][shdc]")
+
 class PokerEnv:
-    def __init__(self, num_players=3, starting_stack=500, small_blind=10, ante=0):
+    def __init__(self, num_players=3, starting_stack=500, small_blind=10, ante=0, evaluator=None, rng=None, stacks=None):
         self.num_players = num_players
         self.starting_stack = starting_stack
         self.small_blind = small_blind
         self.big_blind = small_blind * 2
         self.ante = ante
         
-        self.evaluator = Evaluator()
-        self.reset_tournament()
+        # Any object with treys' evaluate(hand, board), e.g. hand_eval.LookupEvaluator
+        self.evaluator = evaluator or Evaluator()
+        # Seed (int) for reproducible simulation, None for a cryptographic shuffle
+        self.rng = make_rng(rng)
+        self.reset_tournament(stacks)
 
-    def reset_tournament(self):
-        self.players = [{'id': i, 'stack': self.starting_stack, 'active': True, 'name': f'Player_{i}'} for i in range(self.num_players)]
+    def reset_tournament(self, stacks=None):
+        """
+        stacks: per-seat chip counts carried in from elsewhere (e.g. a
+        multi-table tournament). Returns the first hand's observation.
+        """
+        stacks = stacks or [self.starting_stack] * self.num_players
+        self.players = [{'id': i, 'stack': stacks[i], 'active': True, 'name': f'Player_{i}'} for i in range(self.num_players)]
         self.blind_level = 0
         self.dealer_pos = 0
-        self.reset_hand()
+        return self.reset_hand()
+
+    def set_blinds(self, small_blind, ante=0, level=None):
+        """New blinds and ante, taking effect from the next hand."""
+        self.small_blind = small_blind
+        self.big_blind = small_blind * 2
+        self.ante = ante
+        if level is not None:
+            self.blind_level = level
 
     def reset_hand(self):
         # Check if tournament is over
@@ -29,25 +132,20 @@ class PokerEnv:
         self.community_cards = []
         self.current_bet = 0
         
-        # Secure Randomness for "Legit" Generator
-        import secrets
-        self.rng = secrets.SystemRandom()
-        
         # Reset player states for the hand
         for p in self.players:
             p['hand'] = []
             p['current_bet'] = 0
             p['folded'] = False
             p['all_in'] = False
+            p['ante'] = 0
             if p['stack'] == 0:
                 p['active'] = False
             else:
                 p['active'] = True
 
-        # Deal hands with secure shuffle
-        self.deck = Deck()
-        self.deck.shuffle = lambda: self.rng.shuffle(self.deck.cards) # Monkey patch shuffle
-        self.deck.shuffle()
+        # Deal hands from a deck shuffled by self.rng
+        self.deck = self._new_deck()
         
         for p in self.players:
             if p['active']:
@@ -75,6 +173,11 @@ class PokerEnv:
         self.sb_pos = active_indices[sb_active_idx]
         self.bb_pos = active_indices[bb_active_idx]
         
+        # Antes go straight to the pot, outside the betting round
+        if self.ante:
+            for i in active_indices:
+                self._post_ante(i)
+
         # Post Blinds
         self._post_bet(self.sb_pos, self.small_blind)
         self._post_bet(self.bb_pos, self.big_blind)
@@ -88,7 +191,31 @@ class PokerEnv:
         self.stage = 'PREFLOP' 
         self.aggressor_idx = None # Track who made the last raise for round ending logic
 
-        return self._get_state_str()
+        return self.observation()
+
+    def _new_deck(self):
+        if isinstance(self.rng, np.random.Generator):
+            return _Deck(FULL_DECK[self.rng.permutation(52)].tolist())
+        cards = FULL_DECK.tolist()
+        self.rng.shuffle(cards)
+        return _Deck(cards)
+
+    def _post_ante(self, player_idx):
+        player = self.players[player_idx]
+        paid = min(player['stack'], self.ante)
+        player['stack'] -= paid
+        player['ante'] = paid
+        self.pot += paid
+        if player['stack'] == 0:
+            player['all_in'] = True
+
+    def cancel_hand(self):
+        """Returns the antes and blinds of a hand that was dealt but not played."""
+        for p in self.players:
+            p['stack'] += p['current_bet'] + p['ante']
+            p['current_bet'] = 0
+            p['ante'] = 0
+        self.pot = 0
 
     def _post_bet(self, player_idx, amount):
         player = self.players[player_idx]
@@ -134,7 +261,12 @@ class PokerEnv:
         # AND everyone has acted at least once (unless big blind check)
         
         # Simplified next player logic
-        next_iter_idx = (self.active_iter_idx + 1) % len(active_indices)
+        # A fold removes the player from active_indices, so the next player
+        # slides into the current slot instead of the one after it
+        if action_type == 'fold':
+            next_iter_idx = self.active_iter_idx % max(len(active_indices) - 1, 1)
+        else:
+            next_iter_idx = (self.active_iter_idx + 1) % len(active_indices)
         
         # Determine if we should deal next cards or just move to next player
         # If one player left -> Winner
@@ -154,12 +286,15 @@ class PokerEnv:
         
         if all_matched and (self.aggressor_idx is not None or self.stage != 'PREFLOP' or action_type != 'raise'): 
             # Preflop special case for BB option is tricky, simplifying for MVP
+            if self.stage == 'RIVER':
+                self._next_street() # Showdown
+                return "HAND_OVER", self.reset_hand()
             self._next_street()
             self.active_iter_idx = self._find_first_actor_after_button()
         else:
             self.active_iter_idx = next_iter_idx
 
-        return "playing", self._get_state_str()
+        return "playing", self.observation()
 
     def _find_first_actor_after_button(self):
         # find the first active non-folded player after dealer
@@ -178,19 +313,20 @@ class PokerEnv:
             self.community_cards = self.deck.draw(3)
         elif self.stage == 'FLOP':
             self.stage = 'TURN'
-            self.community_cards.append(self.deck.draw(1))
+            self.community_cards.extend(self.deck.draw(1))
         elif self.stage == 'TURN':
             self.stage = 'RIVER'
-            self.community_cards.append(self.deck.draw(1))
+            self.community_cards.extend(self.deck.draw(1))
         elif self.stage == 'RIVER':
             self._showdown()
             
     def _showdown(self):
         active_in_hand = [p for p in self.players if not p['folded'] and p['active']]
         scores = []
-        for p in active_in_hand:
-            score = self.evaluator.evaluate(self.community_cards, p['hand'])
-            scores.append((score, p))
+        with PROFILER.phase("showdown"):
+            for p in active_in_hand:
+                score = self.evaluator.evaluate(self.community_cards, p['hand'])
+                scores.append((score, p))
         
         # Lower score is better in treys
         scores.sort(key=lambda x: x[0])
@@ -204,20 +340,23 @@ class PokerEnv:
         winner['stack'] += self.pot
         self.pot = 0
         
-    def _get_state_str(self):
-        # Create a text representation for the LLM
+    def observation(self):
+        """Observation of the player to act in the current hand."""
         active_indices = [i for i, p in enumerate(self.players) if p['active']]
-        current_p = self.players[active_indices[self.active_iter_idx]]
-        
-        comm_str = [Card.int_to_str(c) for c in self.community_cards]
-        hand_str = [Card.int_to_str(c) for c in current_p['hand']]
-        
-        return f"""
-        Stage: {self.stage}
-        Pot: {self.pot}
-        Your Stack: {current_p['stack']}
-        To Call: {self.current_bet - current_p['current_bet']}
-        Community Cards: {comm_str}
-        Your Hand: {hand_str}
-        """
+        current_idx = active_indices[self.active_iter_idx]
+        current_p = self.players[current_idx]
+        return Observation(
+            player=current_idx,
+            stage=self.stage,
+            pot=self.pot,
+            stack=current_p['stack'],
+            to_call=self.current_bet - current_p['current_bet'],
+            community=tuple(self.community_cards),
+            hand=tuple(current_p['hand']),
+            num_opponents=len(active_indices) - 1,
+            big_blind=self.big_blind,
+        )
 
+    def _get_state_str(self):
+        # Create a text representation for the LLM
+        return str(self.observation())
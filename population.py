@@ -0,0 +1,202 @@
+import hashlib
+import itertools
+import math
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+from agents import LLMAgent, prepare_tables
+from profiler import PROFILER
+
+
+def match_seed(base_seed, game_id):
+    """Deterministic 32-bit seed for one match."""
+    digest = hashlib.sha256(f"{base_seed}:{game_id}".encode()).digest()
+    return int.from_bytes(digest[:4], "little")
+
+
+def round_robin_pairings(population, table_size=3):
+    """Every distinct table of table_size agents, in a fixed order."""
+    size = min(table_size, len(population))
+    return [list(table) for table in itertools.combinations(population, size)]
+
+
+def swiss_pairings(population, scores, table_size=3, rng=None):
+    """
+    Seats agents with similar scores together. Ties are broken randomly
+    (rng), a leftover of one agent sits the round out.
+    """
+    rng = rng or random.Random()
+    ranked = sorted(population, key=lambda a: (-scores[a.name], rng.random()))
+    tables = [ranked[i:i + table_size] for i in range(0, len(ranked), table_size)]
+    return [table for table in tables if len(table) > 1]
+
+
+def wilson_interval(wins, games, z=1.96):
+    """Wilson score interval (low, high) for a win rate of wins out of games."""
+    if games == 0:
+        return 0.0, 1.0
+    rate = wins / games
+    center = rate + z * z / (2 * games)
+    spread = z * math.sqrt(rate * (1 - rate) / games + z * z / (4 * games * games))
+    denom = 1 + z * z / games
+    # Clamped, as rounding can leave the bounds just outside [0, 1] at 0 or all wins
+    return max(0.0, (center - spread) / denom), min(1.0, (center + spread) / denom)
+
+
+def _play_in_worker(play, agents, args, seed, profile=False):
+    # Runs in a worker process: events and profile counts are collected and replayed by the parent
+    random.seed(seed)
+    PROFILER.enable(profile)
+    PROFILER.reset()
+    events = []
+    result = play(agents, *args, lambda event_type, data: events.append((event_type, data)), seed)
+    return result, events, PROFILER.snapshot() if profile else None
+
+
+class TableRunner:
+    """
+    Plays tables concurrently. Tables made only of local agents (random,
+    rule-based) run on a ProcessPoolExecutor at full CPU width. Tables with
+    an LLMAgent stay in this process on a thread scheduler, so every LLM
+    call goes through the one shared client and in-flight limiter.
+    """
+
+    def __init__(self, workers=None):
+        self.workers = workers
+        self._pool = None
+
+    def run(self, play, tables, scheduler, log_event):
+        """
+        Calls play(agents, *args, log_event, seed) for each (agents, args,
+        seed) in tables and returns the results in order. play must be a
+        module-level function so it can be sent to worker processes.
+        """
+        results = [None] * len(tables)
+        local, remote = [], []
+        for i, (agents, _, _) in enumerate(tables):
+            (remote if any(isinstance(a, LLMAgent) for a in agents) else local).append(i)
+
+        futures = {}
+        if local:
+            prepare_tables(agent for i in local for agent in tables[i][0])
+            pool = self._get_pool()
+            for i in local:
+                agents, args, seed = tables[i]
+                futures[i] = pool.submit(_play_in_worker, play, agents, args, seed, PROFILER.enabled)
+
+        if remote:
+            remote_tables = [(agents, *args, log_event, seed) for agents, args, seed in (tables[i] for i in remote)]
+            for i, result in zip(remote, scheduler.run(play, remote_tables)):
+                results[i] = result
+
+        for i in local:
+            results[i], events, profile = futures[i].result()
+            for event_type, data in events:
+                log_event(event_type, data)
+            if profile:
+                PROFILER.merge(profile)
+        return results
+
+    def _get_pool(self):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self._pool
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+
+class PopulationEvaluator:
+    """
+    Scores a population by playing matches under round-robin, Swiss or
+    racing pairings. Matches are played by a TableRunner on the
+    Tournament's thread scheduler and a process pool.
+
+    Racing treats population[0] as the incumbent and drops an agent once
+    the upper confidence bound on its win rate (z, after min_matches
+    matches) falls below the incumbent's lower bound. The rest of the
+    match budget goes to the agents still racing; the generation ends
+    early once only the incumbent is left. Racing scores are win rates.
+    """
+
+    def __init__(self, tournament, pairing="round_robin", table_size=3, workers=None, seed=0, z=1.96, min_matches=3):
+        if pairing not in ("round_robin", "swiss", "racing"):
+            raise ValueError(f"Unknown pairing: {pairing}")
+        self.tournament = tournament
+        self.pairing = pairing
+        self.table_size = table_size
+        self.workers = workers
+        self.seed = seed
+        self.z = z
+        self.min_matches = min_matches
+        self.runner = TableRunner(workers)
+
+    def evaluate(self, population, gen, num_matches):
+        """Plays up to num_matches matches and returns {agent name: score}."""
+        if len(population) < 2:
+            raise ValueError("A population needs at least 2 agents to play matches")
+        if self.pairing == "racing":
+            return self._race(population, gen, num_matches)
+        scores = {agent.name: 0 for agent in population}
+        if self.pairing == "round_robin":
+            # Pairings do not depend on results, so every match is played in one round
+            tables = itertools.islice(itertools.cycle(round_robin_pairings(population, self.table_size)), num_matches)
+            self._tally(scores, self.play_round([(table, f"G{gen}_M{i}") for i, table in enumerate(tables)]))
+            return scores
+
+        # Swiss: each round is paired on the scores so far
+        rng = random.Random(match_seed(self.seed, f"G{gen}_pairings"))
+        game_idx = 0
+        while game_idx < num_matches:
+            tables = swiss_pairings(population, scores, self.table_size, rng)[:num_matches - game_idx]
+            if not tables:
+                break
+            self._tally(scores, self.play_round([(table, f"G{gen}_M{game_idx + i}") for i, table in enumerate(tables)]))
+            game_idx += len(tables)
+        return scores
+
+    def _race(self, population, gen, num_matches):
+        incumbent = population[0]
+        wins = {agent.name: 0 for agent in population}
+        played = {agent.name: 0 for agent in population}
+        eliminated = []
+        racing = list(population)
+        game_idx = 0
+        while game_idx < num_matches and len(racing) > 1:
+            # One match per pairing, all played concurrently, then the intervals are checked again
+            tables = round_robin_pairings(racing, self.table_size)[:num_matches - game_idx]
+            self._tally(wins, self.play_round([(table, f"G{gen}_M{game_idx + i}") for i, table in enumerate(tables)]))
+            for table in tables:
+                for agent in table:
+                    played[agent.name] += 1
+            game_idx += len(tables)
+
+            incumbent_low, _ = wilson_interval(wins[incumbent.name], played[incumbent.name], self.z)
+            still_racing = []
+            for agent in racing:
+                _, high = wilson_interval(wins[agent.name], played[agent.name], self.z)
+                if agent is incumbent or played[agent.name] < self.min_matches or high >= incumbent_low:
+                    still_racing.append(agent)
+                else:
+                    eliminated.append(agent.name)
+            racing = still_racing
+
+        self.tournament.log_event("racing", {"gen": gen, "matches": game_idx, "played": played, "eliminated": eliminated})
+        return {name: wins[name] / played[name] if played[name] else 0.0 for name in wins}
+
+    @staticmethod
+    def _tally(scores, winners):
+        for winner_name in winners:
+            if winner_name:
+                scores[winner_name] += 1
+
+    def play_round(self, matches):
+        """Plays (agents, game_id) matches concurrently, returning winners in order."""
+        from tournament import play_match
+        tables = [(agents, (game_id,), match_seed(self.seed, game_id)) for agents, game_id in matches]
+        return self.runner.run(play_match, tables, self.tournament.scheduler, self.tournament.log_event)
+
+    def close(self):
+        self.runner.close()
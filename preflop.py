@@ -0,0 +1,109 @@
+import os
+import numpy as np
+from treys import Card
+
+from equity import EquityCalculator
+
+TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "preflop_equity.npy")
+PLAYER_COUNTS = (2, 3)
+NUM_CLASSES = 169
+RANKS = "23456789TJQKA"
+
+
+def hand_class(hand):
+    """
+    Index 0..168 of a two-card hand (treys ints) in the 13x13 grid:
+    pairs on the diagonal, suited hands at [high, low], offsuit at [low, high].
+    """
+    a, b = hand
+    high, low = sorted(((a >> 8) & 0xF, (b >> 8) & 0xF), reverse=True)
+    if (a >> 12) & 0xF == (b >> 12) & 0xF:
+        return high * 13 + low
+    return low * 13 + high
+
+
+def class_name(index):
+    """'AA', 'AKs', 'T9o' ... for a hand_class index."""
+    row, col = divmod(index, 13)
+    if row == col:
+        return RANKS[row] * 2
+    if row > col:
+        return RANKS[row] + RANKS[col] + "s"
+    return RANKS[col] + RANKS[row] + "o"
+
+
+def class_hand(index):
+    """A representative pair of treys card ints for a hand_class index."""
+    name = class_name(index)
+    second_suit = "s" if name.endswith("s") else "h"
+    return [Card.new(name[0] + "s"), Card.new(name[1] + second_suit)]
+
+
+def build_table(path=TABLE_PATH, rollouts=100000, seed=0):
+    """
+    Simulates the all-in preflop equity of every hand class at each player
+    count in PLAYER_COUNTS and writes a (len(PLAYER_COUNTS), 169) float32 table.
+    """
+    calc = EquityCalculator(seed=seed, max_rollouts=rollouts, tolerance=0.0)
+    table = np.empty((len(PLAYER_COUNTS), NUM_CLASSES), dtype=np.float32)
+    for row, num_players in enumerate(PLAYER_COUNTS):
+        for index in range(NUM_CLASSES):
+            table[row, index] = calc.estimate(class_hand(index), (), num_players - 1).equity
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        np.save(f, table)
+    os.replace(tmp_path, path)
+
+
+class PreflopTable:
+    """
+    O(1) preflop equity lookups from the memory-mapped table at path,
+    which is built on first use (about a minute).
+    """
+
+    def __init__(self, path=TABLE_PATH):
+        if not os.path.exists(path):
+            build_table(path)
+        self.table = np.load(path, mmap_mode='r')
+        self._row = {n: i for i, n in enumerate(PLAYER_COUNTS)}
+
+    def equity(self, hand, num_players=2):
+        """Equity of hand (two treys ints) all-in preflop against num_players - 1 random hands."""
+        return float(self.table[self._row[num_players], hand_class(hand)])
+
+    def percentile(self, hand, num_players=2):
+        """Fraction of the 1326 starting hands that hand is at least as strong as."""
+        row = self.table[self._row[num_players]]
+        index = hand_class(hand)
+        return float(_COMBOS[row <= row[index]].sum() / _COMBOS.sum())
+
+    def ranking(self, num_players=2):
+        """Hand class names from strongest to weakest."""
+        return [class_name(i) for i in np.argsort(-self.table[self._row[num_players]], kind='stable')]
+
+
+# Card combinations per class: 6 per pair, 4 suited, 12 offsuit
+_COMBOS = np.array([6 if r == c else 4 if r > c else 12 for r in range(13) for c in range(13)])
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Precompute the preflop equity table")
+    parser.add_argument("--out", default=TABLE_PATH)
+    parser.add_argument("--rollouts", type=int, default=100000)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    build_table(args.out, rollouts=args.rollouts)
+    print(f"Built {args.out} in {time.perf_counter() - start:.1f}s")
+
+    table = PreflopTable(args.out)
+    for num_players in PLAYER_COUNTS:
+        print(f"{num_players} players, top 10: {' '.join(table.ranking(num_players)[:10])}")
+    hand = [Card.new("Ah"), Card.new("Kh")]
+    start = time.perf_counter()
+    for _ in range(100000):
+        table.equity(hand, 3)
+    print(f"AKs 3-way: {table.equity(hand, 3):.3f} ({100000 / (time.perf_counter() - start):,.0f} lookups/sec)")
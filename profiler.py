@@ -0,0 +1,146 @@
+import os
+import threading
+import time
+from contextlib import nullcontext
+
+_NULL = nullcontext()
+_NUM_BUCKETS = 40 # Bucket i holds durations in [2^(i-1), 2^i) microseconds
+
+
+class Histogram:
+    """Log2-bucketed duration histogram (seconds in, microsecond buckets)."""
+
+    __slots__ = ("buckets", "count", "total", "max")
+
+    def __init__(self):
+        self.buckets = [0] * _NUM_BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds):
+        self.buckets[min(int(seconds * 1e6).bit_length(), _NUM_BUCKETS - 1)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def merge(self, other):
+        self.buckets = [a + b for a, b in zip(self.buckets, other.buckets)]
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def percentile(self, q):
+        """Upper edge (seconds) of the bucket holding the q-th quantile."""
+        target = q * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if n and seen >= target:
+                return min((1 << i) / 1e6, self.max)
+        return self.max
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "total": self.total,
+            "mean": self.total / self.count if self.count else 0.0,
+            "p50": self.percentile(0.5),
+            "p95": self.percentile(0.95),
+            "max": self.max,
+        }
+
+
+class _Timer:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.profiler.observe(self.name, time.perf_counter() - self.start)
+
+
+class Profiler:
+    """
+    Per-phase timers, counters and latency histograms.
+
+    with PROFILER.phase("step"): ... times a block, PROFILER.count("hands")
+    bumps a counter and PROFILER.observe("llm", seconds) records a latency
+    measured elsewhere. Disabled (the default unless POKER_PROFILE=1), every
+    call returns straight away.
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.reset()
+
+    def enable(self, enabled=True):
+        self.enabled = enabled
+
+    def reset(self):
+        with self._lock:
+            self.timers = {}
+            self.counters = {}
+
+    def phase(self, name):
+        if not self.enabled:
+            return _NULL
+        return _Timer(self, name)
+
+    def observe(self, name, seconds):
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self.timers.get(name)
+            if histogram is None:
+                histogram = self.timers[name] = Histogram()
+            histogram.add(seconds)
+
+    def count(self, name, n=1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def snapshot(self):
+        """Picklable copy of the raw timers and counters, for merge()."""
+        with self._lock:
+            return {
+                "timers": {name: (h.buckets[:], h.count, h.total, h.max) for name, h in self.timers.items()},
+                "counters": dict(self.counters),
+            }
+
+    def merge(self, snapshot):
+        """Adds a snapshot() taken in another process."""
+        with self._lock:
+            for name, (buckets, count, total, max_) in snapshot["timers"].items():
+                other = Histogram()
+                other.buckets, other.count, other.total, other.max = buckets, count, total, max_
+                self.timers.setdefault(name, Histogram()).merge(other)
+            for name, n in snapshot["counters"].items():
+                self.counters[name] = self.counters.get(name, 0) + n
+
+    def summary(self):
+        with self._lock:
+            return {
+                "timers": {name: h.summary() for name, h in sorted(self.timers.items())},
+                "counters": dict(sorted(self.counters.items())),
+            }
+
+    def format_summary(self):
+        summary = self.summary()
+        lines = [f"{'phase':12s} {'count':>9s} {'total s':>9s} {'mean ms':>9s} {'p50 ms':>9s} {'p95 ms':>9s} {'max ms':>9s}"]
+        for name, t in summary["timers"].items():
+            lines.append(f"{name:12s} {t['count']:>9d} {t['total']:>9.3f} {t['mean'] * 1e3:>9.3f} {t['p50'] * 1e3:>9.3f} {t['p95'] * 1e3:>9.3f} {t['max'] * 1e3:>9.3f}")
+        lines.append("  ".join(f"{name}={n}" for name, n in summary["counters"].items()))
+        return "\n".join(lines)
+
+
+PROFILER = Profiler(enabled=os.environ.get("POKER_PROFILE") == "1")
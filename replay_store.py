@@ -0,0 +1,139 @@
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+from event_log import read_events
+from poker_env import Observation
+
+# One row per "move" event. Repeated strings are dictionary-encoded so each
+# agent name, game id, stage and action is stored once per row group.
+MOVE_COLUMNS = [
+    ("timestamp", "float64"),
+    ("game_id", "dictionary"),
+    ("hand_num", "int32"),
+    ("agent", "dictionary"),
+    ("stage", "dictionary"),
+    ("player", "int8"),
+    ("pot", "int32"),
+    ("stack", "int32"),
+    ("to_call", "int32"),
+    ("community", "cards"),
+    ("hand", "cards"),
+    ("action", "dictionary"),
+    ("amount", "int32"),
+]
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("pyarrow is required for the replay store (pip install pyarrow)")
+
+
+def move_schema():
+    _require_pyarrow()
+    types = {
+        "float64": pa.float64(),
+        "int32": pa.int32(),
+        "int8": pa.int8(),
+        "dictionary": pa.dictionary(pa.int32(), pa.string()),
+        "cards": pa.list_(pa.int32()),
+    }
+    return pa.schema([(name, types[kind]) for name, kind in MOVE_COLUMNS])
+
+
+def _parse_state_view(state_view):
+    """Move state as a dict; older logs stored the rendered prompt text."""
+    if isinstance(state_view, dict):
+        return state_view
+    obs = Observation.from_text(state_view)
+    return obs.to_dict() if obs else {}
+
+
+def _move_row(entry):
+    data = entry["data"]
+    state = _parse_state_view(data.get("state_view", {}))
+    return {
+        "timestamp": entry.get("timestamp"),
+        "game_id": data.get("game_id"),
+        "hand_num": data.get("hand_num"),
+        "agent": data.get("agent"),
+        "stage": state.get("stage"),
+        "player": state.get("player"),
+        "pot": state.get("pot"),
+        "stack": state.get("stack"),
+        "to_call": state.get("to_call"),
+        "community": state.get("community"),
+        "hand": state.get("hand"),
+        "action": data.get("action"),
+        "amount": data.get("amount"),
+    }
+
+
+def convert_jsonl(jsonl_path, out_path, row_group_size=65536):
+    """
+    Streams the move events of a tournament log (plain, .gz or .zst)
+    into a Parquet file, one row group at a time.
+    Returns the number of moves written.
+    """
+    schema = move_schema()
+    num_moves = 0
+    with pq.ParquetWriter(out_path, schema, compression="zstd") as writer:
+        rows = []
+        for entry in read_events(jsonl_path):
+            if entry.get("type") != "move":
+                continue
+            rows.append(_move_row(entry))
+            if len(rows) >= row_group_size:
+                writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+                num_moves += len(rows)
+                rows = []
+        if rows:
+            writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+            num_moves += len(rows)
+    return num_moves
+
+
+def _move_filter(stage=None, agent_prefix=None):
+    condition = None
+    if stage is not None:
+        condition = ds.field("stage") == stage
+    if agent_prefix is not None:
+        agent_match = pc.starts_with(ds.field("agent").cast(pa.string()), agent_prefix)
+        condition = agent_match if condition is None else condition & agent_match
+    return condition
+
+
+def scan_moves(path, stage=None, agent_prefix=None, columns=None, batch_size=65536):
+    """
+    Yields pyarrow RecordBatches of moves matching the filters, e.g.
+    scan_moves(path, stage="RIVER", agent_prefix="Gen2_").
+    Filters are pushed down to the Parquet reader, so only one batch is
+    held in memory at a time. path may be a file or a directory of files.
+    """
+    _require_pyarrow()
+    dataset = ds.dataset(path, format="parquet")
+    yield from dataset.to_batches(columns=columns, filter=_move_filter(stage, agent_prefix), batch_size=batch_size)
+
+
+def load_moves(path, stage=None, agent_prefix=None, columns=None):
+    """Matching moves as a single pyarrow Table."""
+    _require_pyarrow()
+    dataset = ds.dataset(path, format="parquet")
+    return dataset.to_table(columns=columns, filter=_move_filter(stage, agent_prefix))
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Convert a tournament JSONL log to a Parquet replay store")
+    parser.add_argument("jsonl", help="tournament_data.jsonl (.gz/.zst accepted)")
+    parser.add_argument("out", help="Output .parquet file")
+    parser.add_argument("--row-group-size", type=int, default=65536)
+    args = parser.parse_args()
+
+    num_moves = convert_jsonl(args.jsonl, args.out, row_group_size=args.row_group_size)
+    print(f"Wrote {num_moves} moves to {args.out}")
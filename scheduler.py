@@ -0,0 +1,27 @@
+from concurrent.futures import ThreadPoolExecutor
+
+
+class MatchScheduler:
+    """
+    Plays many tournament matches at once on a thread pool.
+
+    Matches spend nearly all their time waiting on the LLM server, so
+    threads are enough: while one table waits for a decision the others
+    keep playing. The number of requests actually sent to the server is
+    capped separately by the agents' shared limiter (see LLMAgent).
+    """
+
+    def __init__(self, max_tables=8):
+        self.max_tables = max_tables
+
+    def run(self, play_match, matches):
+        """
+        matches: list of play_match argument tuples, e.g. (agents, game_id, seed)
+        Returns the play_match results in the same order as matches.
+        """
+        if self.max_tables <= 1:
+            return [play_match(*match) for match in matches]
+
+        with ThreadPoolExecutor(max_workers=self.max_tables, thread_name_prefix="table") as pool:
+            futures = [pool.submit(play_match, *match) for match in matches]
+            return [f.result() for f in futures]
@@ -0,0 +1,14 @@
+import pytest
+
+from batch_poker_env import differential_check
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_matches_poker_env(seed):
+    differential_check(num_tables=50, num_steps=1000, seed=seed)
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_matches_poker_env_with_antes(seed):
+    # A 100-chip ante against 500-chip stacks soon puts players all-in from the ante alone
+    differential_check(num_tables=50, num_steps=1000, seed=seed, ante=100)
@@ -0,0 +1,40 @@
+import pytest
+from treys import Card
+
+from equity import EquityCalculator
+
+
+def cards(*names):
+    return [Card.new(name) for name in names]
+
+
+@pytest.fixture(scope="module")
+def calc():
+    return EquityCalculator(seed=0, tolerance=0.003)
+
+
+def test_aces_heads_up(calc):
+    # Pocket aces win about 85% against a random hand
+    result = calc.estimate(cards("Ah", "As"), num_opponents=1)
+    assert result.equity == pytest.approx(0.852, abs=0.01)
+    assert result.win + result.tie <= 1
+
+
+def test_nuts_on_the_river(calc):
+    result = calc.estimate(cards("Ah", "Kh"), cards("Qh", "Jh", "Th", "2c", "3d"), num_opponents=2)
+    assert result.equity == 1.0
+    assert result.win == 1.0
+
+
+def test_board_plays_splits_the_pot(calc):
+    # A royal flush on the board ties every hand
+    result = calc.estimate(cards("2c", "3d"), cards("As", "Ks", "Qs", "Js", "Ts"), num_opponents=1)
+    assert result.tie == 1.0
+    assert result.equity == pytest.approx(0.5)
+
+
+def test_seed_reproduces_estimate():
+    calc = EquityCalculator(batch_size=256, max_rollouts=256)
+    hand, board = cards("9s", "9d"), cards("Ac", "Kd", "4h")
+    assert calc.estimate(hand, board, 2, seed=7) == calc.estimate(hand, board, 2, seed=7)
+    assert EquityCalculator(seed=1).estimate(hand, board) == EquityCalculator(seed=1).estimate(hand, board)
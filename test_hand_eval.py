@@ -0,0 +1,31 @@
+import random
+
+import numpy as np
+import pytest
+from treys import Deck, Evaluator
+
+from hand_eval import LookupEvaluator
+
+
+@pytest.fixture(scope="module")
+def evaluator():
+    return LookupEvaluator()
+
+
+@pytest.mark.parametrize("num_cards", [5, 6, 7])
+def test_matches_treys(evaluator, num_cards):
+    rng = random.Random(num_cards)
+    deck = Deck.GetFullDeck()
+    treys_evaluator = Evaluator()
+    for _ in range(2000):
+        cards = rng.sample(deck, num_cards)
+        assert evaluator.evaluate(cards[:2], cards[2:]) == treys_evaluator.evaluate(cards[:2], cards[2:])
+
+
+@pytest.mark.parametrize("num_cards", [5, 6, 7])
+def test_batch_matches_single(evaluator, num_cards):
+    rng = random.Random(num_cards)
+    deck = Deck.GetFullDeck()
+    hands = [rng.sample(deck, num_cards) for _ in range(2000)]
+    ranks = evaluator.evaluate_batch(np.array(hands))
+    assert ranks.tolist() == [evaluator.evaluate(h[:2], h[2:]) for h in hands]
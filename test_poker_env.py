@@ -0,0 +1,33 @@
+import json
+from dataclasses import replace
+
+from poker_env import Observation, PokerEnv
+
+
+def observations(num_hands=20):
+    env = PokerEnv(rng=0)
+    obs = env.reset_hand()
+    while num_hands:
+        yield obs
+        status, obs = env.step('call', 0)
+        if status == "HAND_OVER":
+            num_hands -= 1
+            if obs is None:
+                obs = env.reset_tournament()
+
+
+def test_text_round_trip():
+    for obs in observations():
+        # The text view carries neither the seat, the opponent count nor the blinds
+        assert Observation.from_text(str(obs)) == replace(obs, player=None, num_opponents=1, big_blind=0)
+
+
+def test_dict_round_trip():
+    for obs in observations():
+        data = json.loads(json.dumps(obs.to_dict()))
+        restored = Observation(**{**data, "community": tuple(data["community"]), "hand": tuple(data["hand"])})
+        assert restored == obs
+
+
+def test_unparseable_text():
+    assert Observation.from_text("no game state here") is None
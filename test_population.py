@@ -0,0 +1,24 @@
+import pytest
+
+from population import wilson_interval
+
+
+def test_no_games_is_uninformative():
+    assert wilson_interval(0, 0) == (0.0, 1.0)
+
+
+def test_known_interval():
+    low, high = wilson_interval(5, 10)
+    assert low == pytest.approx(0.2366, abs=1e-4)
+    assert high == pytest.approx(0.7634, abs=1e-4)
+
+
+@pytest.mark.parametrize("wins, games", [(0, 5), (3, 5), (5, 5), (40, 100)])
+def test_interval_contains_rate_within_bounds(wins, games):
+    low, high = wilson_interval(wins, games)
+    assert 0.0 <= low <= wins / games <= high <= 1.0
+
+
+def test_interval_narrows_with_games():
+    widths = [high - low for low, high in (wilson_interval(n // 2, n) for n in (10, 100, 1000))]
+    assert widths == sorted(widths, reverse=True)
@@ -1,20 +1,129 @@
 from poker_env import PokerEnv
+import agents as agents_module
 from agents import LLMAgent, RandomAgent
 from evolution import PromptMutator
-import json
+from scheduler import MatchScheduler
+from population import PopulationEvaluator
+from decision_cache import DecisionCache
+from event_log import EventLogWriter
+from profiler import PROFILER
 import time
+import threading
+import gzip
+import json
+import os
+import random
+
+def play_hands(env, agents, game_id, log_event, max_hands=30):
+    """
+    Plays up to max_hands hands on env, agents[i] sitting in seat i, and
+    logs every move. Stops early once one player has all the chips.
+    Returns the number of hands played, or None if the env reports GAME_OVER.
+    """
+    # The env deals its first hand on construction
+    env_state = env.observation()
+    hands_played = 0
+    
+    while hands_played < max_hands:
+        if env_state is None: 
+            break
+            
+        game_over = False
+        while not game_over:
+            current_agent = agents[env_state.player]
+            
+            # Get Action
+            PROFILER.count("decisions")
+            try:
+                with PROFILER.phase("decision"):
+                    action, amount = current_agent.get_action(env_state)
+            except Exception as e:
+                print(f"Agent Error: {e}")
+                action, amount = 'fold', 0
+            
+            # Log the decision context
+            with PROFILER.phase("serialize"):
+                state_view = env_state.to_dict()
+            decision_record = {
+                "game_id": game_id,
+                "hand_num": hands_played,
+                "agent": current_agent.name,
+                "state_view": state_view,
+                "action": action,
+                "amount": amount
+            }
+            with PROFILER.phase("logging"):
+                log_event("move", decision_record)
+            print(f"{current_agent.name}: {action} {amount}")
+            
+            # Step Env (includes showdown)
+            with PROFILER.phase("step"):
+                status, state_or_res = env.step(action, amount)
+            
+            if status == "HAND_OVER":
+                print("Hand Over")
+                PROFILER.count("hands")
+                hands_played += 1
+                game_over = True
+                env_state = state_or_res
+            elif status == "GAME_OVER":
+                 return None
+            else:
+                env_state = state_or_res 
+                
+    return hands_played
+
+def play_match(agents, game_id, log_event, seed=None):
+    """
+    Plays one match and returns the winner's name.
+    Events go to log_event(event_type, data), so this also runs in worker processes.
+    seed makes the deck shuffles reproducible; None shuffles cryptographically.
+    """
+    env = PokerEnv(num_players=len(agents), rng=seed)
+    if play_hands(env, agents, game_id, log_event, max_hands=30) is None:
+        return None
+        
+    # Winner
+    final_stacks = [p['stack'] for p in env.players]
+    best_idx = final_stacks.index(max(final_stacks))
+    winner = agents[best_idx].name
+    
+    log_event("match_end", {"game_id": game_id, "winner": winner, "stacks": final_stacks})
+    return winner
 
 class Tournament:
-    def __init__(self, num_generations=5, games_per_gen=10, log_file="tournament_data.jsonl"):
+    def __init__(self, num_generations=5, games_per_gen=10, log_file="tournament_data.jsonl", max_tables=4, max_inflight=4, cache_file=None, log_compression=None, log_max_bytes=None, pairing="round_robin", workers=None, seed=0, checkpoint_file=None, resume=False, profile=False, llm_stream=False):
         self.num_generations = num_generations
         self.games_per_gen = games_per_gen
         self.population = []
         self.mutator = PromptMutator()
         self.log_file = log_file
         
-        # Clear log file
-        with open(self.log_file, 'w') as f:
-            pass
+        # Concurrent tables share one cap on in-flight LLM requests
+        self.scheduler = MatchScheduler(max_tables=max_tables)
+        self.llm_limiter = threading.BoundedSemaphore(max_inflight)
+        # LLMAgents stream completions and stop at the first Action line
+        self.llm_stream = llm_stream
+        
+        # Pairs the whole population; non-LLM tables run on worker processes
+        self.evaluator = PopulationEvaluator(self, pairing=pairing, workers=workers, seed=seed)
+        
+        # Opt-in decision cache, persisted to cache_file between runs
+        self.decision_cache = DecisionCache(cache_file) if cache_file else None
+        
+        # Phase timers and counters, summarized at the end of each generation
+        if profile:
+            PROFILER.enable()
+        
+        # Population, scores, RNG state and next generation, saved after every generation
+        self.checkpoint_file = checkpoint_file
+        self.start_gen = 0
+        self.last_scores = {}
+        
+        # Clear log file unless resuming; events are written in batches by a background thread
+        self.event_log = EventLogWriter(self.log_file, mode='a' if resume else 'w', compression=log_compression, max_bytes=log_max_bytes)
+        if resume and checkpoint_file and os.path.exists(checkpoint_file):
+            self.load_checkpoint(checkpoint_file)
         
     def log_event(self, event_type, data):
         entry = {
@@ -22,8 +131,7 @@ class Tournament:
             "type": event_type,
             "data": data
         }
-        with open(self.log_file, 'a') as f:
-            f.write(json.dumps(entry) + "\n")
+        self.event_log.write(entry)
 
     def initialize_population(self, size=3):
         # Gen 0
@@ -36,90 +144,75 @@ class Tournament:
         Action: [Action]
         """
         for i in range(size):
-            agent = LLMAgent(name=f"Gen0_Agent{i}", system_prompt=base_prompt)
+            agent = LLMAgent(name=f"Gen0_Agent{i}", system_prompt=base_prompt, limiter=self.llm_limiter, cache=self.decision_cache, stream=self.llm_stream)
             self.population.append(agent)
             self.log_event("agent_creation", {"name": agent.name, "prompt": base_prompt})
 
     def run(self):
-        for gen in range(self.num_generations):
+        for gen in range(self.start_gen, self.num_generations):
             print(f"=== Generation {gen} ===")
             self.log_event("generation_start", {"gen": gen})
-            scores = {agent.name: 0 for agent in self.population}
             
-            # Batch of Games
-            for game_idx in range(self.games_per_gen):
-                # Basic Round Robin or Free For All in 3-max
-                players = self.population[:3] 
-                winner_name = self.play_match(players, game_id=f"G{gen}_M{game_idx}")
-                if winner_name:
-                    scores[winner_name] += 1
+            # Batch of Games, played on concurrent tables
+            scores = self.evaluator.evaluate(self.population, gen, self.games_per_gen)
             
             # Ranking
             sorted_agents = sorted(self.population, key=lambda x: scores[x.name], reverse=True)
             print(f"Gen {gen} Results: {scores}")
             self.log_event("generation_results", scores)
+            self.log_event("llm_stats", self.mutator.client.stats())
+            if self.decision_cache:
+                self.decision_cache.save()
+                self.log_event("decision_cache_stats", self.decision_cache.stats())
+            if PROFILER.enabled:
+                print(PROFILER.format_summary())
+                self.log_event("profile", {"gen": gen, **PROFILER.summary()})
+                PROFILER.reset()
+            self.event_log.flush()
             
             if gen < self.num_generations - 1:
                 self.evolve(sorted_agents, gen)
+            self.last_scores = scores
+            if self.checkpoint_file:
+                self.save_checkpoint(gen + 1)
                 
-    def play_match(self, agents, game_id):
-        env = PokerEnv(num_players=len(agents))
-        env_state = env.reset_hand()
-        
-        hands_played = 0
-        max_hands = 30
-        
-        match_log = []
-        
-        while hands_played < max_hands:
-            if env_state is None: 
-                break
-                
-            game_over = False
-            while not game_over:
-                active_indices = [i for i, p in enumerate(env.players) if p['active']]
-                current_idx = active_indices[env.active_iter_idx]
-                current_agent = agents[current_idx]
-                
-                # Get Action
-                try:
-                    action, amount = current_agent.get_action(env_state)
-                except Exception as e:
-                    print(f"Agent Error: {e}")
-                    action, amount = 'fold', 0
-                
-                # Log the decision context
-                decision_record = {
-                    "game_id": game_id,
-                    "hand_num": hands_played,
-                    "agent": current_agent.name,
-                    "state_view": env_state,
-                    "action": action,
-                    "amount": amount
-                }
-                self.log_event("move", decision_record)
-                print(f"{current_agent.name}: {action} {amount}")
-                
-                # Step Env
-                status, state_or_res = env.step(action, amount)
-                
-                if status == "HAND_OVER":
-                    print("Hand Over")
-                    hands_played += 1
-                    game_over = True
-                    env_state = state_or_res
-                elif status == "GAME_OVER":
-                     return None
-                else:
-                    env_state = state_or_res 
-                    
-        # Winner
-        final_stacks = [p['stack'] for p in env.players]
-        best_idx = final_stacks.index(max(final_stacks))
-        winner = agents[best_idx].name
-        
-        self.log_event("match_end", {"game_id": game_id, "winner": winner, "stacks": final_stacks})
-        return winner
+    def save_checkpoint(self, next_gen, path=None):
+        """Atomically writes the state needed to continue from next_gen (gzipped JSON)."""
+        path = path or self.checkpoint_file
+        state = {
+            "next_gen": next_gen,
+            "population": [_agent_spec(agent) for agent in self.population],
+            "scores": self.last_scores,
+            "seed": self.evaluator.seed,
+            "random_state": random.getstate(),
+        }
+        tmp_path = f"{path}.tmp"
+        with gzip.open(tmp_path, 'wt') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, path)
+        self.log_event("checkpoint", {"path": path, "next_gen": next_gen})
+
+    def load_checkpoint(self, path=None):
+        path = path or self.checkpoint_file
+        with gzip.open(path, 'rt') as f:
+            state = json.load(f)
+        self.start_gen = state["next_gen"]
+        self.last_scores = state["scores"]
+        self.evaluator.seed = state["seed"]
+        version, internal, gauss_next = state["random_state"]
+        random.setstate((version, tuple(internal), gauss_next))
+        self.population = [self._restore_agent(spec) for spec in state["population"]]
+        self.log_event("resume", {"path": path, "gen": self.start_gen, "population": [a.name for a in self.population]})
+
+    def _restore_agent(self, spec):
+        if spec["class"] == "LLMAgent":
+            return LLMAgent(name=spec["name"], model_name=spec["model_name"], api_url=spec["api_url"], system_prompt=spec["system_prompt"], limiter=self.llm_limiter, cache=self.decision_cache, stream=self.llm_stream)
+        agent = getattr(agents_module, spec["class"])(spec["name"])
+        agent.system_prompt = spec["system_prompt"]
+        return agent
+
+    def play_match(self, agents, game_id, seed=None):
+        return play_match(agents, game_id, self.log_event, seed)
 
     def evolve(self, sorted_agents, gen):
         best_agent = sorted_agents[0]
@@ -127,17 +220,33 @@ class Tournament:
         
         new_population = [best_agent]
         
-        # Mutate
-        for i in range(2):
-            new_prompt = self.mutator.mutate_prompt(best_agent.system_prompt)
-            new_agent = LLMAgent(name=f"Gen{gen+1}_Mutant_{i}", system_prompt=new_prompt)
+        # Mutate: all children in one batched, deduplicated request
+        for i, new_prompt in enumerate(self.mutator.mutate_batch(best_agent.system_prompt, 2)):
+            new_agent = LLMAgent(name=f"Gen{gen+1}_Mutant_{i}", system_prompt=new_prompt, limiter=self.llm_limiter, cache=self.decision_cache, stream=self.llm_stream)
             new_population.append(new_agent)
             self.log_event("agent_creation", {"name": new_agent.name, "parent": best_agent.name, "prompt": new_prompt})
             
         self.population = new_population
 
+def _agent_spec(agent):
+    # Enough to rebuild the agent; native agents come back with default parameters
+    spec = {"class": type(agent).__name__, "name": agent.name, "system_prompt": agent.system_prompt}
+    if isinstance(agent, LLMAgent):
+        spec.update(model_name=agent.model_name, api_url=agent.api_url)
+    return spec
+
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run a prompt-evolution poker tournament")
+    parser.add_argument("--checkpoint", default="tournament_checkpoint.json.gz")
+    parser.add_argument("--resume", action="store_true", help="Continue from --checkpoint, appending to the existing log")
+    parser.add_argument("--profile", action="store_true", help="Print phase timings at the end of each generation")
+    parser.add_argument("--stream", action="store_true", help="Stream LLM decisions, cancelling once the action is parsed")
+    args = parser.parse_args()
+
     # Increased games per gen for better data
-    t = Tournament(num_generations=3, games_per_gen=5) 
-    t.initialize_population()
+    t = Tournament(num_generations=3, games_per_gen=5, checkpoint_file=args.checkpoint, resume=args.resume, profile=args.profile, llm_stream=args.stream)
+    if not t.population:
+        t.initialize_population()
     t.run()